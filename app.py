@@ -1,23 +1,28 @@
 import os
 from collections import defaultdict
-from flask import Flask, redirect, url_for, render_template, session, request, flash, jsonify
+from flask import Flask, redirect, url_for, render_template, session, request, flash, jsonify, g
 from flask_dance.contrib.github import make_github_blueprint, github
 from werkzeug.middleware.proxy_fix import ProxyFix
 from dotenv import load_dotenv
 from werkzeug.utils import secure_filename
 from datetime import datetime
-from utils.repo_utils import move_or_copy_item
+from utils.session_store import MongoSessionInterface, compact_user_profile
+from utils.upload_store import get_upload_store
+from utils.scheduler import estimate_job_cost, get_queue_status
+from utils import tracing
+from utils.assets import AssetPipeline
+from utils.path_index import PathIndexCache
+from utils.repo_cache import RepoCache
 import uuid
+import json
 # --- NEW IMPORTS ---
 import threading # To run the worker in the background
-from worker import process_jobs # Import the worker's main function
 
 # --- NEW IMPORTS FOR MONGODB ---
 from flask_pymongo import PyMongo
 
 # --- YOUR EXISTING UTILS IMPORTS ---
 from utils.repo_utils import (
-    create_repo_from_zip, 
     get_user_repos, 
     get_repo_contents, 
     get_file_content, 
@@ -26,7 +31,9 @@ from utils.repo_utils import (
     create_new_folder,
     delete_repo,
     get_repo_stats,
-    get_repo_languages
+    get_repo_languages,
+    get_head_sha,
+    get_repo_tree_paths
 )
 
 # This setting is the final fix for the OAuth scope warning
@@ -43,7 +50,11 @@ app.config.update(
     SESSION_COOKIE_SAMESITE='Lax',
     # --- NEW: MONGODB CONFIGURATION ---
     # This reads the connection string from your .env file
-    MONGO_URI=os.environ.get("MONGO_URI")
+    MONGO_URI=os.environ.get("MONGO_URI"),
+    # Uploads bigger than this are refused with 413 before they're spooled or saved to the upload store.
+    MAX_CONTENT_LENGTH=int(os.environ.get("MAX_UPLOAD_BYTES", 200 * 1024 * 1024)),
+    # Set GITHUB_TRACE_LOG=true to log a 'github-trace' JSON line for each request that calls GitHub.
+    GITHUB_TRACE_LOG=os.environ.get("GITHUB_TRACE_LOG", "false").lower() == "true"
 )
 # This is required for running behind a reverse proxy (common in production).
 app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
@@ -55,8 +66,28 @@ if not app.config["MONGO_URI"]:
 
 os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 
+# --- NEW: STATIC ASSET PIPELINE ---
+# Serves static files under content-hashed URLs with immutable caching and gzip/brotli,
+# and compresses other text responses on the fly.
+assets = AssetPipeline(app)
+
 # --- NEW: MONGODB SETUP ---
-mongo = PyMongo(app)
+# connect=False defers opening connections until the first query, so importing the app
+# stays fast and no MongoDB threads exist before gunicorn forks its workers.
+mongo = PyMongo(app, connect=False)
+
+# --- NEW: SERVER-SIDE SESSIONS ---
+# The cookie only carries a session id; the session data itself lives in MongoDB.
+# Static files and fingerprinted assets never read the session, so they skip the session lookup.
+app.session_interface = MongoSessionInterface(
+    lambda: mongo.db.sessions,
+    sessionless_paths=(app.static_url_path + "/", assets.url_prefix + "/")
+)
+
+# --- NEW: CACHED REPOSITORY LISTS ---
+# The dashboard and analytics read each user's repositories from MongoDB for a couple of
+# minutes instead of calling GitHub on every page load.
+repo_cache = RepoCache(lambda: mongo.db.repo_cache)
 
 # --- GitHub OAuth Blueprint (Unchanged) ---
 github_bp = make_github_blueprint(
@@ -66,9 +97,64 @@ github_bp = make_github_blueprint(
     redirect_to="github_login"
 )
 app.register_blueprint(github_bp, url_prefix="/login")
-print("Starting background worker thread...")
-worker_thread = threading.Thread(target=process_jobs, daemon=True)
-worker_thread.start()
+
+# --- NEW: "GO TO FILE" PATH INDEXES ---
+# One in-memory path index per recently searched repository, rebuilt when its head commit changes.
+path_indexes = PathIndexCache()
+
+# --- BACKGROUND WORKER STARTUP ---
+# The worker is no longer started at import time. gunicorn starts it from the post_worker_init hook
+# in gunicorn.conf.py; any other server starts it on the first request.
+worker_thread = None
+worker_thread_lock = threading.Lock()
+
+def start_background_worker():
+    """Starts the job worker thread once per process, unless RUN_WORKER_IN_WEB=false."""
+    global worker_thread
+    # Set RUN_WORKER_IN_WEB=false when workers run as separate processes (`python worker.py`).
+    if worker_thread is not None or os.environ.get("RUN_WORKER_IN_WEB", "true").lower() != "true":
+        return
+    with worker_thread_lock:
+        if worker_thread is None:
+            from worker import process_jobs # Import the worker's main function only when it's needed
+            print("Starting background worker thread...")
+            worker_thread = threading.Thread(target=process_jobs, daemon=True)
+            worker_thread.start()
+
+@app.before_request
+def ensure_background_worker():
+    start_background_worker()
+
+# --- NEW: PER-REQUEST GITHUB CALL TRACING ---
+
+@app.before_request
+def start_github_trace():
+    g.github_trace_token = tracing.start_trace()
+
+@app.after_request
+def report_github_trace(response):
+    """
+    Adds a Server-Timing header and, with GITHUB_TRACE_LOG on, logs a structured summary of the
+    GitHub calls this request made. Static assets never call GitHub, so they get neither.
+    """
+    trace = tracing.current_trace()
+    if trace is None or request.endpoint in ("static", "asset"):
+        return response
+    response.headers["Server-Timing"] = trace.server_timing()
+    if trace.calls and app.config["GITHUB_TRACE_LOG"]:
+        print("github-trace " + json.dumps({
+            "method": request.method,
+            "route": request.url_rule.rule if request.url_rule else request.path,
+            "status": response.status_code,
+            "github": trace.summary(),
+        }))
+    return response
+
+@app.teardown_request
+def end_github_trace(exc):
+    token = g.pop("github_trace_token", None)
+    if token is not None:
+        tracing.end_trace(token)
 
 # --- Standard Application Routes (Unchanged) ---
 
@@ -89,47 +175,74 @@ def github_login():
         flash("Failed to fetch your user information from GitHub.", "error")
         return redirect(url_for("home"))
 
-    session["github_user"] = resp.json()
+    session["github_user"] = compact_user_profile(resp.json())
+    # A new session id on login, so an id set before authentication can't be reused.
+    session.regenerate()
     return redirect(url_for("dashboard"))
 
 @app.route("/api/repo/<repo_name>/move", methods=["POST"])
 def move_item_in_repo(repo_name):
     """
-    API endpoint to handle moving or copying a SINGLE item or a LIST of items.
+    Queues moving or copying a SINGLE item or a LIST of items as a background job. File-level
+    progress is reported by /api/upload/status/<job_id>, like uploads.
     """
     if not github.authorized or "github_user" not in session:
         return jsonify({"success": False, "error": "Not authorized"}), 401
 
-    data = request.get_json()
-    source_path = data.get("source_path") # This can now be a string OR a list of strings
-    destination_path = data.get("destination_path")
-    operation = data.get("operation")
+    from utils.move_jobs import parse_move_request, estimate_move_cost
+    try:
+        source_paths, destination_path, operation = parse_move_request(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
 
-    if not all([source_path, operation]):
-        return jsonify({"success": False, "error": "Missing source path or operation type."}), 400
+    job_id = str(uuid.uuid4())
+    mongo.db.jobs.insert_one({
+        "_id": job_id,
+        "type": "move_copy",
+        "status": "queued",
+        "created_at": datetime.utcnow(),
+        "access_token": github.token["access_token"],
+        "owner": session["github_user"]["login"],
+        "repo_name": repo_name,
+        "operation": operation,
+        "source_paths": source_paths,
+        "destination_path": destination_path,
+        # The worker expands the selection into one item per file and advances 'cursor' as each completes.
+        "items": None,
+        "cursor": 0,
+        "cost": estimate_move_cost(len(source_paths)),
+        "result": None
+    })
+    return jsonify({"success": True, "job_id": job_id, "status_url": url_for("api_upload_status", job_id=job_id)}), 202
+
+@app.route("/api/repo/<repo_name>/find")
+def find_in_repository(repo_name):
+    """
+    "Go to file": fuzzy-matches ?q= against every file path in the repository.
+    The path list comes from one recursive tree request and is cached per head commit.
+    """
+    if not github.authorized or "github_user" not in session:
+        return jsonify({"success": False, "error": "Not authorized"}), 401
 
     access_token = github.token["access_token"]
     owner = session["github_user"]["login"]
+    query = request.args.get("q", "")
+    limit = max(1, min(request.args.get("limit", 20, type=int), 100))
 
-    # If the source_path is not a list, make it a list with one item for consistent processing
-    source_paths = source_path if isinstance(source_path, list) else [source_path]
-
-    # Loop through each source path and perform the operation
-    for path in source_paths:
-        result = move_or_copy_item(
-            token=access_token,
-            owner=owner,
-            repo_name=repo_name,
-            source_path=path,
-            destination_path=destination_path,
-            operation=operation
-        )
-        # If any single operation fails, stop and return the error immediately
-        if not result["success"]:
-            return jsonify(result)
-
-    # If all operations in the loop succeeded
-    return jsonify({"success": True})
+    result = path_indexes.get_or_build(
+        (owner, repo_name),
+        lambda: get_head_sha(access_token, owner, repo_name),
+        lambda sha: get_repo_tree_paths(access_token, owner, repo_name, sha),
+    )
+    if not result["success"]:
+        return jsonify(result)
+    index = result["index"]
+    return jsonify({
+        "success": True,
+        "results": index.search(query, limit),
+        "total_paths": len(index),
+        "truncated": index.truncated,
+    })
  
  
 @app.route("/dashboard")
@@ -143,7 +256,7 @@ def dashboard():
         resp = github.get("/user")
         if resp.ok:
             # If the fetch is successful, store the data in the session.
-            session["github_user"] = resp.json()
+            session["github_user"] = compact_user_profile(resp.json())
         else:
             # If fetching fails (e.g., token expired), clear the session and send to login.
             session.clear()
@@ -152,7 +265,7 @@ def dashboard():
 
     # 3. Now that we are sure the user data is in the session, proceed as normal.
     access_token = github.token["access_token"]
-    repos = get_user_repos(access_token)
+    repos = repo_cache.get(session["github_user"]["login"], lambda: get_user_repos(access_token))
     
     return render_template("dashboard.html", user=session["github_user"], repos=repos)
 
@@ -177,29 +290,138 @@ def upload():
         flash("Invalid file type. Please upload a .zip file.", "error")
         return redirect(url_for("dashboard"))
 
+    # Read the zip's central directory (nothing is extracted) to reject oversized archives
+    # up front and to build the manifest the user confirms before the job is queued.
+    # (Imported here so the zip machinery isn't loaded until someone uploads.)
+    import zipfile
+    from utils.zip_inspect import build_manifest, check_zip_limits, ZipLimitError
+    try:
+        manifest = build_manifest(project_file.stream)
+        check_zip_limits(manifest["stats"])
+    except zipfile.BadZipFile:
+        flash("The uploaded file is not a valid .zip archive.", "error")
+        return redirect(url_for("dashboard"))
+    except ZipLimitError as e:
+        flash(str(e), "error")
+        return redirect(url_for("dashboard"))
+    project_file.stream.seek(0)
+
     access_token = github.token["access_token"]
     
-    temp_dir = os.path.join(app.root_path, 'tmp', 'uploads')
-    os.makedirs(temp_dir, exist_ok=True)
-    filename = secure_filename(f"{session['github_user']['login']}_{repo_name}_{os.urandom(4).hex()}.zip")
-    temp_filepath = os.path.join(temp_dir, filename)
-    project_file.save(temp_filepath)
+    # Save the archive to the shared upload store so a worker on any node can read it.
+    upload_store = get_upload_store(mongo.db)
+    filename = secure_filename(f"{session['github_user']['login']}_{repo_name}.zip")
+    upload_key = upload_store.save(project_file.stream, filename)
 
+    # The job waits for the user to confirm the manifest on the preview page before it's queued.
     job_id = str(uuid.uuid4())
     job_document = {
         "_id": job_id,
-        "status": "queued",
+        "type": "upload",
+        "status": "awaiting_confirmation",
         "created_at": datetime.utcnow(),
         "access_token": access_token,
-        "temp_filepath": temp_filepath,
+        "upload_store": upload_store.name,
+        "upload_key": upload_key,
         "repo_name": repo_name,
         "is_private": is_private, # <-- NEW: Save the privacy setting in the job
+        "owner": session["github_user"]["login"],
+        "manifest": manifest,
+        "zip_stats": manifest["stats"],
+        "cost": estimate_job_cost(manifest["stats"]),
         "result": None
     }
     mongo.db.jobs.insert_one(job_document)
 
+    return redirect(url_for("upload_preview", job_id=job_id))
+
+
+# --- NEW: UPLOAD PREVIEW AND CONFIRMATION ---
+
+def find_unconfirmed_upload(job_id):
+    """Returns the current user's upload that is still waiting for confirmation, or None."""
+    return mongo.db.jobs.find_one({
+        "_id": job_id,
+        "owner": session["github_user"]["login"],
+        "status": "awaiting_confirmation",
+    })
+
+@app.route("/upload/preview/<job_id>")
+def upload_preview(job_id):
+    """Shows what the archive contains and what will be left out, before the job is queued."""
+    if not github.authorized or "github_user" not in session: return redirect(url_for("home"))
+    job = find_unconfirmed_upload(job_id)
+    if not job:
+        # Already confirmed, cancelled or expired: the status page knows which.
+        return redirect(url_for("upload_status", job_id=job_id))
+    return render_template(
+        "upload_preview.html",
+        job_id=job_id,
+        manifest=job["manifest"],
+        repo_name=job["repo_name"],
+        is_private=job.get("is_private", False),
+    )
+
+@app.route("/upload/confirm/<job_id>", methods=["POST"])
+def confirm_upload(job_id):
+    """Queues a previewed upload, with the repository name and file choices made on the preview page."""
+    if not github.authorized or "github_user" not in session: return redirect(url_for("home"))
+    job = find_unconfirmed_upload(job_id)
+    if not job:
+        return redirect(url_for("upload_status", job_id=job_id))
+
+    from utils.zip_inspect import build_manifest, check_zip_limits, ZipLimitError
+    manifest = job["manifest"]
+    repo_name = request.form.get("repo_name", "").strip() or job["repo_name"]
+    is_private = request.form.get("is_private") == "true"
+    # Patterns the user chose to upload anyway are dropped from the ignore list.
+    keep_patterns = set(request.form.getlist("keep_pattern"))
+    ignore_patterns = [pattern for pattern in manifest["ignore_patterns"] if pattern not in keep_patterns]
+    strip_prefix = manifest["top_level_folder"] if request.form.get("strip_top_level") == "true" else ""
+
+    if ignore_patterns != manifest["ignore_patterns"] or strip_prefix != manifest["strip_prefix"]:
+        # Re-read the central directory so the stats (and limits) match what will be uploaded.
+        upload_store = get_upload_store(mongo.db, job.get("upload_store", "local"))
+        with upload_store.open(job["upload_key"]) as zip_file:
+            manifest = build_manifest(zip_file, ignore_patterns, strip_prefix)
+        try:
+            check_zip_limits(manifest["stats"])
+        except ZipLimitError as e:
+            flash(str(e), "error")
+            return redirect(url_for("upload_preview", job_id=job_id))
+
+    confirmed = mongo.db.jobs.update_one(
+        {"_id": job_id, "status": "awaiting_confirmation"},
+        {"$set": {
+            "status": "queued",
+            # The job joins the queue now, so that's the time the scheduler ages it from.
+            "created_at": datetime.utcnow(),
+            "repo_name": repo_name,
+            "is_private": is_private,
+            "manifest": manifest,
+            "zip_stats": manifest["stats"],
+            "cost": estimate_job_cost(manifest["stats"]),
+            "upload_options": {"ignore_patterns": ignore_patterns, "strip_prefix": strip_prefix},
+        }}
+    )
+    if not confirmed.modified_count:
+        return render_error_page("This upload can no longer be confirmed. It may have expired; please upload it again.")
     return redirect(url_for("upload_status", job_id=job_id))
 
+@app.route("/upload/cancel/<job_id>", methods=["POST"])
+def cancel_upload(job_id):
+    if not github.authorized or "github_user" not in session: return redirect(url_for("home"))
+    job = find_unconfirmed_upload(job_id)
+    if job:
+        cancelled = mongo.db.jobs.update_one(
+            {"_id": job_id, "status": "awaiting_confirmation"},
+            {"$set": {"status": "cancelled", "result": {"success": False, "error": "The upload was cancelled."}}}
+        )
+        if cancelled.modified_count:
+            get_upload_store(mongo.db, job.get("upload_store", "local")).delete(job["upload_key"])
+    flash("Upload cancelled.", "success")
+    return redirect(url_for("dashboard"))
+
 
 # --- NEW ROUTES FOR MONGODB STATUS CHECKING ---
 
@@ -215,14 +437,26 @@ def api_upload_status(job_id):
     # Project only the fields we need
     job = mongo.db.jobs.find_one(
         {"_id": job_id},
-        {"_id": 0, "status": 1, "result": 1, "progress": 1} 
+        {"_id": 0, "type": 1, "status": 1, "result": 1, "progress": 1, "resource_usage": 1, "repo_results": 1,
+         "owner": 1, "repo_name": 1}
     )
     if job:
+        # A finished move changed the repository's paths, so "go to file" should check its head again.
+        if job.get('type') == 'move_copy' and job['status'] in ('finished', 'failed'):
+            path_indexes.mark_stale((job['owner'], job['repo_name']))
         response_data = {
+            'type': job.get('type', 'upload'),
             'status': job['status'],
             'result': job.get('result'),
-            'progress': job.get('progress') # <-- ADD THIS LINE
+            'progress': job.get('progress'), # <-- ADD THIS LINE
+            'resource_usage': job.get('resource_usage')
         }
+        # Bulk jobs report each repository's outcome as soon as it's known.
+        if 'repo_results' in job:
+            response_data['repo_results'] = job['repo_results']
+        # While waiting, report where the job is in the fair-share queue.
+        if job['status'] == 'queued':
+            response_data['queue'] = get_queue_status(mongo.db.jobs, job_id)
     else:
         response_data = {'status': 'not_found'}
 
@@ -234,7 +468,7 @@ def dashboard_analytics():
     if not github.authorized or "github_user" not in session: return jsonify({"error": "Not authorized"}), 401
     access_token = github.token["access_token"]
     owner = session["github_user"]["login"]
-    repos = get_user_repos(access_token)
+    repos = repo_cache.get(owner, lambda: get_user_repos(access_token))
     if not repos: return jsonify({"total_stars": 0, "language_stats": {}, "top_language": "N/A", "commit_history": [0]*52})
     total_stars = sum(repo.get('stargazers_count', 0) for repo in repos)
     language_stats = defaultdict(int)
@@ -293,6 +527,7 @@ def new_file(repo_name):
     full_path = os.path.join(current_path, new_file_name).replace("\\", "/")
     result = create_new_file(access_token, owner, repo_name, full_path, f"feat: Create new file '{new_file_name}'")
     if result.get("success"):
+        path_indexes.mark_stale((owner, repo_name))
         flash(f"Successfully created file '{new_file_name}'!", "success")
         return redirect(url_for("edit_file", repo_name=repo_name, file_path=full_path))
     else: return render_error_page(result.get("error"))
@@ -306,40 +541,80 @@ def new_folder(repo_name):
     full_path = os.path.join(current_path, new_folder_name).replace("\\", "/")
     result = create_new_folder(access_token, owner, repo_name, full_path)
     if result.get("success"):
+        path_indexes.mark_stale((owner, repo_name))
         flash(f"Successfully created folder '{new_folder_name}'!", "success")
         return redirect(url_for("view_repository", repo_name=repo_name, folder_path=full_path))
     else: return render_error_page(result.get("error"))
 
+@app.route("/api/repos/bulk", methods=["POST"])
+def bulk_repo_operation():
+    """
+    Queues one operation (delete, make_private, make_public, archive, unarchive) across many
+    repositories as a background job. Progress and per-repository results are reported by
+    /api/upload/status/<job_id>, like uploads.
+    """
+    if not github.authorized or "github_user" not in session:
+        return jsonify({"success": False, "error": "Not authorized"}), 401
+
+    from utils.bulk_ops import parse_bulk_request, estimate_bulk_cost
+    try:
+        operation, repo_names = parse_bulk_request(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    job_id = str(uuid.uuid4())
+    mongo.db.jobs.insert_one({
+        "_id": job_id,
+        "type": "bulk_repo_ops",
+        "status": "queued",
+        "created_at": datetime.utcnow(),
+        "access_token": github.token["access_token"],
+        "owner": session["github_user"]["login"],
+        "operation": operation,
+        "repos": repo_names,
+        "repo_results": [],
+        "cost": estimate_bulk_cost(len(repo_names)),
+        "result": None
+    })
+    return jsonify({"success": True, "job_id": job_id, "status_url": url_for("api_upload_status", job_id=job_id)}), 202
+
 @app.route("/delete_repo/<repo_name>", methods=["POST"])
 def delete_repo_route(repo_name):
     if not github.authorized or "github_user" not in session: return redirect(url_for("home"))
     access_token, owner = github.token["access_token"], session["github_user"]["login"]
     result = delete_repo(access_token, owner, repo_name)
-    if result.get("success"): flash(f"Repository '{repo_name}' has been permanently deleted.", "success")
+    if result.get("success"):
+        repo_cache.remove(owner, repo_name)
+        flash(f"Repository '{repo_name}' has been permanently deleted.", "success")
     else: flash(f"Error deleting repository '{repo_name}': {result.get('error')}", "error")
     return redirect(url_for("dashboard"))
 
 @app.route("/logout")
 def logout():
     session.clear()
+    session.regenerate()
     flash("You have been successfully logged out.", "info")
     return redirect(url_for("home"))
 
 
-# --- HTML Rendering Helper Functions (Unchanged) ---
+# --- HTML Rendering Helper Functions ---
+# These used to be inline f-strings; as templates they're compiled once and share a cached stylesheet.
 
 def render_success_page(repo_url, repo_name):
     """Renders a professional success page with modern styling."""
-    return f'''
-    <!DOCTYPE html><html lang="en"><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"><title>Upload Successful</title><link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet"><style>body{{font-family:'Inter',sans-serif;background:linear-gradient(135deg,#667eea 0%,#764ba2 100%);display:flex;align-items:center;justify-content:center;min-height:100vh;padding:20px;}}.success-container{{background:rgba(255,255,255,0.95);border-radius:24px;padding:60px 40px;text-align:center;box-shadow:0 25px 50px rgba(0,0,0,0.15);max-width:500px;width:100%;}}.success-icon{{width:80px;height:80px;background:linear-gradient(135deg,#10b981,#059669);border-radius:50%;display:flex;align-items:center;justify-content:center;margin:0 auto 30px;}}.success-icon i{{font-size:36px;color:white;}}.success-title{{font-size:28px;font-weight:700;color:#1f2937;margin-bottom:16px;}}.success-message{{font-size:16px;color:#6b7280;margin-bottom:40px;}}.repo-card{{background:#f8fafc;border:2px solid #e5e7eb;border-radius:16px;padding:24px;margin-bottom:40px;}}.repo-name{{font-size:18px;font-weight:600;color:#1f2937;}}.btn{{padding:14px 28px;border-radius:12px;text-decoration:none;font-weight:600;font-size:14px;display:inline-flex;align-items:center;gap:8px;}}.btn-primary{{background:linear-gradient(135deg,#6366f1,#4f46e5);color:white;}}.btn-secondary{{background:white;color:#6b7280;border:2px solid #e5e7eb;}}</style></head><body><div class="success-container"><div class="success-icon"><i class="fas fa-check"></i></div><h1 class="success-title">Upload Successful!</h1><p class="success-message">Your project is now live in your new GitHub repository.</p><div class="repo-card"><div class="repo-name"><i class="fab fa-github"></i> {repo_name}</div></div><div style="display:flex;gap:16px;justify-content:center;"><a href="{repo_url}" class="btn btn-primary" target="_blank"><i class="fas fa-external-link-alt"></i> View on GitHub</a><a href="/dashboard" class="btn btn-secondary"><i class="fas fa-arrow-left"></i> To Dashboard</a></div></div></body></html>
-    '''
+    return render_template("success_page.html", repo_url=repo_url, repo_name=repo_name)
+
+@app.errorhandler(413)
+def upload_too_large(error):
+    limit_mb = app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024)
+    flash(f"The uploaded file is too large; the limit is {limit_mb} MB.", "error")
+    return redirect(url_for("dashboard"))
 
 def render_error_page(error_message):
     """Renders a professional error page with modern styling."""
-    return f'''
-    <!DOCTYPE html><html lang="en"><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"><title>Upload Failed</title><link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet"><style>body{{font-family:'Inter',sans-serif;background:linear-gradient(135deg,#ef4444 0%,#dc2626 100%);display:flex;align-items:center;justify-content:center;min-height:100vh;padding:20px;}}.error-container{{background:rgba(255,255,255,0.95);border-radius:24px;padding:60px 40px;text-align:center;box-shadow:0 25px 50px rgba(0,0,0,0.15);max-width:500px;width:100%;}}.error-icon{{width:80px;height:80px;background:linear-gradient(135deg,#ef4444,#dc2626);border-radius:50%;display:flex;align-items:center;justify-content:center;margin:0 auto 30px;}}.error-icon i{{font-size:36px;color:white;}}.error-title{{font-size:28px;font-weight:700;color:#1f2937;margin-bottom:16px;}}.error-message{{font-size:16px;color:#6b7280;margin-bottom:40px;padding:20px;background:#fef2f2;border-radius:12px;border-left:4px solid #ef4444;text-align:left;}}.btn{{padding:14px 28px;border-radius:12px;text-decoration:none;font-weight:600;font-size:14px;display:inline-flex;align-items:center;gap:8px;background:linear-gradient(135deg,#6366f1,#4f46e5);color:white;}}</style></head><body><div class="error-container"><div class="error-icon"><i class="fas fa-exclamation-triangle"></i></div><h1 class="error-title">An Error Occurred</h1><div class="error-message"><strong>Details:</strong> {error_message}</div><a href="/dashboard" class="btn"><i class="fas fa-arrow-left"></i> Back to Dashboard</a></div></body></html>
-    '''
+    return render_template("error_page.html", error_message=error_message)
 
 # --- Main Execution ---
 if __name__ == '__main__':
+    start_background_worker()
     app.run(debug=True, port=5000)
@@ -0,0 +1,10 @@
+# gunicorn reads this file automatically when started from the project root (`gunicorn app:app`).
+
+
+def post_worker_init(worker):
+    """
+    Starts the background job worker once the web worker has forked and loaded the app,
+    so the import itself stays fast and no threads exist in the master before forking.
+    """
+    from app import start_background_worker
+    start_background_worker()
@@ -0,0 +1,111 @@
+"""
+Cold-start benchmark for the web service.
+
+Each run starts a fresh Python process, imports the app (with the in-memory MongoDB
+from the load test, so nothing touches the network) and serves its first requests.
+The report shows the median import time and first-request latency across runs, plus the
+slowest modules from `python -X importtime`, so startup regressions are easy to spot.
+
+Usage (from the repository root):
+    python -m loadtest.coldstart --runs 5
+    python -m loadtest.coldstart --max-import-ms 400   # exits non-zero above the budget
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+FIRST_REQUESTS = ["/", "/api/upload/status/coldstart"]
+
+
+def measure_once():
+    """Runs inside the child process: times the import and the first requests, prints JSON."""
+    import mongomock  # noqa: F401  (imported up front so it isn't counted as app import time)
+    from loadtest.run import load_app
+
+    started = time.perf_counter()
+    app, _ = load_app("http://127.0.0.1:9")
+    imported = time.perf_counter()
+    client = app.test_client()
+    request_ms = {}
+    for path in FIRST_REQUESTS:
+        request_started = time.perf_counter()
+        client.get(path)
+        request_ms[path] = round((time.perf_counter() - request_started) * 1000, 1)
+    print(json.dumps({
+        "import_ms": round((imported - started) * 1000, 1),
+        "first_request_ms": request_ms,
+    }))
+
+
+def slowest_imports(limit):
+    """Returns (cumulative_us, module) for 'app' and the modules it imports directly, slowest first."""
+    code = "from loadtest.coldstart import measure_once; measure_once()"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=os.environ.copy())
+    children, app_rows = [], []
+    # Lines look like "import time:  self_us |  cumulative_us |   module"; children are listed
+    # before their parent and indented two spaces per level.
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue
+        module = fields[2].rstrip()
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((int(fields[1]), module.strip()))
+        elif depth == 0:
+            if module.strip() == "app":
+                app_rows = children + [(int(fields[1]), "app")]
+            children = []
+    return sorted(app_rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure web service cold start.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--max-import-ms", type=float, help="fail if the median import time is above this")
+    parser.add_argument("--max-first-request-ms", type=float, help="fail if the median first request is above this")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_once()
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        result = subprocess.run(
+            [sys.executable, "-m", "loadtest.coldstart", "--child"],
+            capture_output=True, text=True, check=True, env=os.environ.copy()
+        )
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    first_ms = statistics.median(run["first_request_ms"][FIRST_REQUESTS[0]] for run in runs)
+    print(f"app import: median {import_ms} ms over {args.runs} runs")
+    for path in FIRST_REQUESTS:
+        print(f"first GET {path}: median {statistics.median(run['first_request_ms'][path] for run in runs)} ms")
+
+    print("\nslowest imports (cumulative ms):")
+    for cumulative_us, module in slowest_imports(args.top):
+        print(f"  {cumulative_us / 1000:>8.1f}  {module}")
+
+    failed = False
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"\nFAIL: import time {import_ms} ms is over the {args.max_import_ms} ms budget")
+        failed = True
+    if args.max_first_request_ms is not None and first_ms > args.max_first_request_ms:
+        print(f"\nFAIL: first request {first_ms} ms is over the {args.max_first_request_ms} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+A small in-memory stand-in for the parts of the GitHub REST API that ProjectPusher uses.
+
+It serves a generated set of repositories over HTTP with configurable latency, a share of
+202 responses from the stats endpoints (GitHub is still computing) and a share of 403
+rate-limit responses, so the app can be load tested without api.github.com.
+"""
+
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, unquote
+
+LANGUAGES = ["Python", "JavaScript", "HTML", "Go", "Rust", None]
+
+
+def _sha(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+class FakeGitHubState:
+    """Generated repositories and files, shared by all request handler threads."""
+
+    def __init__(self, login="loadtest-user", repo_count=30, dirs_per_repo=5, files_per_dir=20, seed=1):
+        rng = random.Random(seed)
+        self.login = login
+        self.lock = threading.Lock()
+        self.repos = {}
+        for i in range(repo_count):
+            files = {"README.md": f"# repo-{i}\n".encode()}
+            for d in range(dirs_per_repo):
+                for f in range(files_per_dir):
+                    files[f"src/pkg{d}/module_{f}.py"] = f"# module {d}/{f}\n{'x = 1' * rng.randint(1, 200)}\n".encode()
+            self.repos[f"repo-{i}"] = {
+                "files": files,
+                "private": i % 3 == 0,
+                "archived": False,
+                "language": LANGUAGES[i % len(LANGUAGES)],
+                "stars": rng.randint(0, 500),
+                "updated_at": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T12:00:00Z",
+                "head": _sha(f"repo-{i}:0".encode()),
+            }
+
+    def directories(self, repo_name):
+        """All folder paths in a repository, including the root ('')."""
+        dirs = {""}
+        for path in self.repos[repo_name]["files"]:
+            parts = path.split("/")[:-1]
+            for i in range(1, len(parts) + 1):
+                dirs.add("/".join(parts[:i]))
+        return sorted(dirs)
+
+    def commit(self, repo_name, path):
+        """Moves the repository's head to a new commit after a change to 'path'."""
+        repo = self.repos[repo_name]
+        repo["head"] = _sha(f"{repo['head']}:{path}".encode())
+        return repo["head"]
+
+    def repo_summary(self, name):
+        repo = self.repos[name]
+        return {
+            "name": name,
+            "full_name": f"{self.login}/{name}",
+            "description": f"Generated repository {name}",
+            "language": repo["language"],
+            "stargazers_count": repo["stars"],
+            "updated_at": repo["updated_at"],
+            "html_url": f"https://github.com/{self.login}/{name}",
+            "private": repo["private"],
+            "archived": repo["archived"],
+        }
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- helpers ---
+
+    def _send(self, status, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Remaining", "4999")
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _simulate(self):
+        """Applies the configured latency; returns False if this request got a 403 instead."""
+        config = self.server.config
+        delay = max(0.0, random.gauss(config["latency_ms"], config["jitter_ms"])) / 1000
+        time.sleep(delay)
+        if random.random() < config["rate_limit_ratio"]:
+            self._send(403, {"message": "API rate limit exceeded"})
+            return False
+        return True
+
+    def _dispatch(self, method):
+        if not self._simulate():
+            return
+        path = unquote(urlparse(self.path).path).rstrip("/")
+        state = self.server.state
+        for pattern, handler_name in ROUTES.get(method, []):
+            match = re.fullmatch(pattern, path)
+            if match:
+                with state.lock:
+                    return getattr(self, handler_name)(state, **match.groupdict())
+        self._send(404, {"message": "Not Found"})
+
+    def do_GET(self): self._dispatch("GET")
+    def do_POST(self): self._dispatch("POST")
+    def do_PUT(self): self._dispatch("PUT")
+    def do_PATCH(self): self._dispatch("PATCH")
+    def do_DELETE(self): self._dispatch("DELETE")
+
+    # --- endpoints ---
+
+    def get_user(self, state):
+        self._send(200, {"login": state.login, "name": "Load Test", "avatar_url": ""})
+
+    def list_repos(self, state):
+        self._send(200, [state.repo_summary(name) for name in state.repos])
+
+    def patch_repo(self, state, owner, repo):
+        if repo not in state.repos:
+            return self._send(404, {"message": "Not Found"})
+        data = self._read_json()
+        for field in ("private", "archived"):
+            if field in data:
+                state.repos[repo][field] = bool(data[field])
+        self._send(200, state.repo_summary(repo))
+
+    def delete_repo(self, state, owner, repo):
+        if state.repos.pop(repo, None) is None:
+            return self._send(404, {"message": "Not Found"})
+        self._send(204)
+
+    def get_contents(self, state, owner, repo, path=""):
+        if repo not in state.repos:
+            return self._send(404, {"message": "Not Found"})
+        files = state.repos[repo]["files"]
+        path = path or ""
+        if path in files:
+            content = files[path]
+            return self._send(200, {
+                "type": "file", "name": path.split("/")[-1], "path": path, "sha": _sha(content),
+                "content": base64.b64encode(content).decode(), "encoding": "base64",
+                "html_url": f"https://github.com/{state.login}/{repo}/blob/main/{path}",
+            })
+        prefix = f"{path}/" if path else ""
+        entries = {}
+        for file_path, content in files.items():
+            if not file_path.startswith(prefix):
+                continue
+            name, _, rest = file_path[len(prefix):].partition("/")
+            item_path = prefix + name
+            entries[name] = {
+                "type": "dir" if rest else "file", "name": name, "path": item_path,
+                "sha": _sha(item_path.encode()) if rest else _sha(content),
+                "html_url": f"https://github.com/{state.login}/{repo}/tree/main/{item_path}",
+            }
+        if not entries:
+            return self._send(404, {"message": "Not Found"})
+        self._send(200, list(entries.values()))
+
+    def put_contents(self, state, owner, repo, path):
+        if repo not in state.repos:
+            return self._send(404, {"message": "Not Found"})
+        data = self._read_json()
+        files = state.repos[repo]["files"]
+        if path in files and "sha" not in data:
+            return self._send(422, {"message": "Invalid request.\n\n\"sha\" wasn't supplied."})
+        files[path] = base64.b64decode(data.get("content", ""))
+        self._send(201 if "sha" not in data else 200, {
+            "content": {"path": path, "sha": _sha(files[path])},
+            "commit": {"sha": state.commit(repo, path)},
+        })
+
+    def delete_contents(self, state, owner, repo, path):
+        files = state.repos.get(repo, {}).get("files", {})
+        if files.pop(path, None) is None:
+            return self._send(404, {"message": "Not Found"})
+        self._send(200, {"commit": {"sha": state.commit(repo, path)}})
+
+    def list_commits(self, state, owner, repo):
+        if repo not in state.repos:
+            return self._send(404, {"message": "Not Found"})
+        self._send(200, [{"sha": state.repos[repo]["head"]}])
+
+    def get_tree(self, state, owner, repo, sha):
+        if repo not in state.repos:
+            return self._send(404, {"message": "Not Found"})
+        files = state.repos[repo]["files"]
+        tree = [{"path": path, "type": "tree", "sha": _sha(path.encode())} for path in state.directories(repo) if path]
+        tree += [{"path": path, "type": "blob", "sha": _sha(content), "size": len(content)} for path, content in files.items()]
+        self._send(200, {"sha": sha, "tree": tree, "truncated": False})
+
+    def get_stats(self, state, owner, repo, stat_type):
+        if random.random() < self.server.config["stats_202_ratio"]:
+            return self._send(202, {})
+        self._send(200, {"all": [random.randint(0, 20) for _ in range(52)], "owner": [random.randint(0, 10) for _ in range(52)]})
+
+    def get_languages(self, state, owner, repo):
+        language = state.repos.get(repo, {}).get("language")
+        self._send(200, {language: 10000} if language else {})
+
+
+OWNER_REPO = r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)"
+ROUTES = {
+    "GET": [
+        (r"/user", "get_user"),
+        (r"/user/repos", "list_repos"),
+        (OWNER_REPO + r"/contents(?:/(?P<path>.*))?", "get_contents"),
+        (OWNER_REPO + r"/stats/(?P<stat_type>[^/]+)", "get_stats"),
+        (OWNER_REPO + r"/languages", "get_languages"),
+        (OWNER_REPO + r"/commits", "list_commits"),
+        (OWNER_REPO + r"/git/trees/(?P<sha>[^/]+)", "get_tree"),
+    ],
+    "PUT": [(OWNER_REPO + r"/contents/(?P<path>.+)", "put_contents")],
+    "PATCH": [(OWNER_REPO, "patch_repo")],
+    "DELETE": [
+        (OWNER_REPO + r"/contents/(?P<path>.+)", "delete_contents"),
+        (OWNER_REPO, "delete_repo"),
+    ],
+}
+
+
+def start_fake_github(state, latency_ms=80, jitter_ms=20, stats_202_ratio=0.3, rate_limit_ratio=0.0, port=0):
+    """Starts the fake API on a background thread and returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeGitHubHandler)
+    server.daemon_threads = True
+    server.state = state
+    server.config = {
+        "latency_ms": latency_ms,
+        "jitter_ms": jitter_ms,
+        "stats_202_ratio": stats_202_ratio,
+        "rate_limit_ratio": rate_limit_ratio,
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -0,0 +1,262 @@
+"""
+Load test for the Flask app, run entirely on this machine.
+
+The app is imported with a fake GitHub API (loadtest.fake_github) and an in-memory
+MongoDB (mongomock) in place of the real services. Virtual users then drive a mix of
+dashboard, repository browsing, "go to file" searches, editing, move/copy and upload-status polling traffic
+through a fixed pool of "workers", modelling gunicorn sync workers, and the run is
+reported as throughput, p50/p99 latency per route and worker saturation.
+
+Usage (from the repository root):
+    pip install -r requirements.txt -r loadtest/requirements.txt
+    python -m loadtest.run --users 20 --workers 2 --duration 30 --latency-ms 80
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import types
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+from loadtest.fake_github import FakeGitHubState, start_fake_github
+
+# Relative weights of each kind of request in the traffic mix.
+DEFAULT_MIX = {
+    "dashboard": 25,
+    "dashboard_analytics": 5,
+    "view_repository": 30,
+    "find_file": 10,
+    "edit_file": 15,
+    "save_file": 5,
+    "move_item": 5,
+    "upload_status": 15,
+}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile.
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def load_app(github_url):
+    """Imports the app wired to the fake GitHub and an in-memory MongoDB."""
+    try:
+        import mongomock
+    except ImportError:
+        sys.exit("The load test needs mongomock: pip install -r loadtest/requirements.txt")
+
+    os.environ.update({
+        "FLASK_SECRET_KEY": "loadtest",
+        "MONGO_URI": "mongodb://127.0.0.1:1/loadtest",
+        "GITHUB_CLIENT_ID": "loadtest",
+        "GITHUB_CLIENT_SECRET": "loadtest",
+        "GITHUB_API_URL": github_url,
+        "RUN_WORKER_IN_WEB": "false",
+    })
+    import app as app_module
+
+    db = mongomock.MongoClient().loadtest
+    app_module.mongo = types.SimpleNamespace(db=db, cx=db.client)
+    return app_module.app, db
+
+
+def seed_jobs(db, login, count=20):
+    """Creates upload jobs in various states for the status-polling traffic."""
+    job_ids = []
+    for i in range(count):
+        job_id = str(uuid.uuid4())
+        status = ["queued", "processing", "finished"][i % 3]
+        db.jobs.insert_one({
+            "_id": job_id,
+            "status": status,
+            "created_at": datetime.utcnow(),
+            "owner": f"{login}-{i % 4}",
+            "cost": 5 + i,
+            "progress": {"step": "Uploading...", "percentage": 50} if status == "processing" else None,
+            "result": {"success": True, "repo_url": "https://github.com/x/y", "repo_name": "y"} if status == "finished" else None,
+        })
+        job_ids.append(job_id)
+    return job_ids
+
+
+class VirtualUser:
+    """A logged-in browser session issuing requests one after another."""
+
+    def __init__(self, app, state, job_ids, rng):
+        self.client = app.test_client()
+        self.state = state
+        self.job_ids = job_ids
+        self.rng = rng
+        with self.client.session_transaction() as session:
+            session["github_oauth_token"] = {"access_token": "loadtest-token", "token_type": "bearer"}
+            session["github_user"] = {"login": state.login, "avatar_url": "", "name": "Load Test"}
+
+    def _random_repo(self):
+        return self.rng.choice(list(self.state.repos))
+
+    def _random_file(self, repo_name):
+        return self.rng.choice(list(self.state.repos[repo_name]["files"]))
+
+    def request(self, route):
+        """Issues one request of the given kind and returns its HTTP status."""
+        c = self.client
+        if route == "dashboard":
+            return c.get("/dashboard").status_code
+        if route == "dashboard_analytics":
+            return c.get("/api/dashboard_analytics").status_code
+        if route == "view_repository":
+            repo_name = self._random_repo()
+            folder = self.rng.choice(self.state.directories(repo_name))
+            return c.get(f"/repo/{repo_name}/{folder}").status_code
+        if route == "find_file":
+            repo_name = self._random_repo()
+            query = self._random_file(repo_name).rsplit("/", 1)[-1][:self.rng.randint(3, 8)]
+            return c.get(f"/api/repo/{repo_name}/find", query_string={"q": query}).status_code
+        if route == "edit_file":
+            repo_name = self._random_repo()
+            return c.get(f"/repo/{repo_name}/edit/{self._random_file(repo_name)}").status_code
+        if route == "save_file":
+            repo_name = self._random_repo()
+            file_path = self._random_file(repo_name)
+            return c.post(f"/repo/{repo_name}/save/{file_path}", data={
+                "content": f"# edited at {time.time()}\n", "commit_message": "loadtest edit", "sha": "loadtest",
+            }).status_code
+        if route == "move_item":
+            repo_name = self._random_repo()
+            return c.post(f"/api/repo/{repo_name}/move", json={
+                "source_path": self._random_file(repo_name),
+                "destination_path": f"copies/{uuid.uuid4().hex[:8]}",
+                "operation": "copy",
+            }).status_code
+        if route == "upload_status":
+            return c.get(f"/api/upload/status/{self.rng.choice(self.job_ids)}").status_code
+        raise ValueError(f"Unknown route '{route}'")
+
+
+def run_load(app, state, job_ids, users, workers, duration, think_ms, mix, seed):
+    """Runs closed-loop virtual users for 'duration' seconds and returns the raw samples."""
+    worker_slots = threading.Semaphore(workers)
+    samples = []
+    samples_lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    routes, weights = zip(*mix.items())
+
+    def user_loop(index):
+        rng = random.Random(seed + index)
+        user = VirtualUser(app, state, job_ids, rng)
+        while time.monotonic() < deadline:
+            route = rng.choices(routes, weights)[0]
+            queued_at = time.monotonic()
+            with worker_slots:
+                started_at = time.monotonic()
+                try:
+                    status = user.request(route)
+                except Exception as e:
+                    print(f"{route} raised {e!r}")
+                    status = 599
+                finished_at = time.monotonic()
+            with samples_lock:
+                samples.append({
+                    "route": route,
+                    "status": status,
+                    "latency": finished_at - queued_at,
+                    "service": finished_at - started_at,
+                    "wait": started_at - queued_at,
+                })
+            if think_ms:
+                time.sleep(rng.expovariate(1000 / think_ms))
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=user_loop, args=(i,), daemon=True) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.monotonic() - started
+
+
+def summarize(samples, wall_seconds, workers):
+    by_route = defaultdict(list)
+    for sample in samples:
+        by_route[sample["route"]].append(sample)
+
+    routes = {}
+    for route, route_samples in sorted(by_route.items()):
+        latencies = sorted(s["latency"] * 1000 for s in route_samples)
+        routes[route] = {
+            "requests": len(route_samples),
+            "errors": sum(1 for s in route_samples if s["status"] >= 500),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "mean_ms": round(sum(latencies) / len(latencies), 1),
+        }
+
+    busy_seconds = sum(s["service"] for s in samples)
+    return {
+        "requests": len(samples),
+        "seconds": round(wall_seconds, 2),
+        "throughput_rps": round(len(samples) / wall_seconds, 2) if wall_seconds else 0,
+        "worker_saturation": round(busy_seconds / (workers * wall_seconds), 3) if wall_seconds else 0,
+        "mean_queue_wait_ms": round(sum(s["wait"] for s in samples) / len(samples) * 1000, 1) if samples else 0,
+        "routes": routes,
+    }
+
+
+def print_report(report):
+    print(f"\n{report['requests']} requests in {report['seconds']}s "
+          f"-> {report['throughput_rps']} req/s, worker saturation {report['worker_saturation']:.0%}, "
+          f"mean queue wait {report['mean_queue_wait_ms']} ms\n")
+    print(f"{'route':<22}{'requests':>10}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for route, row in report["routes"].items():
+        print(f"{route:<22}{row['requests']:>10}{row['errors']:>8}{row['p50_ms']:>10}{row['p99_ms']:>10}{row['mean_ms']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test ProjectPusher against a fake GitHub.")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--workers", type=int, default=1, help="simulated gunicorn sync workers")
+    parser.add_argument("--duration", type=float, default=20, help="seconds to run")
+    parser.add_argument("--think-ms", type=float, default=200, help="mean pause between a user's requests")
+    parser.add_argument("--latency-ms", type=float, default=80, help="mean fake GitHub latency")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="standard deviation of fake GitHub latency")
+    parser.add_argument("--stats-202-ratio", type=float, default=0.3, help="share of stats calls answered with 202")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="share of calls answered with 403")
+    parser.add_argument("--repos", type=int, default=30, help="generated repositories")
+    parser.add_argument("--mix", type=json.loads, default=DEFAULT_MIX, help="JSON object of route weights")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    state = FakeGitHubState(repo_count=args.repos, seed=args.seed)
+    _, github_url = start_fake_github(
+        state,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        stats_202_ratio=args.stats_202_ratio,
+        rate_limit_ratio=args.rate_limit_ratio,
+    )
+    app, db = load_app(github_url)
+    job_ids = seed_jobs(db, state.login)
+
+    samples, wall_seconds = run_load(
+        app, state, job_ids, args.users, args.workers, args.duration, args.think_ms, args.mix, args.seed
+    )
+    report = summarize(samples, wall_seconds, args.workers)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
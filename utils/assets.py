@@ -0,0 +1,150 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+from flask import abort, current_app, request, url_for
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it responses fall back to gzip.
+    brotli = None
+
+# Long-lived caching is safe because every asset URL contains a hash of its content.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+COMPRESSIBLE_MIMETYPES = {
+    "text/html", "text/css", "text/plain", "text/javascript",
+    "application/javascript", "application/json", "image/svg+xml",
+}
+# Bodies smaller than this aren't worth the CPU or the Content-Encoding header.
+MIN_COMPRESS_BYTES = 1024
+
+
+def _hashed_name(filename, content):
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    root, ext = os.path.splitext(filename)
+    return f"{root}.{digest}{ext}"
+
+
+def choose_encoding(accept_encodings):
+    """Picks 'br', 'gzip' or None from a request's Accept-Encoding header."""
+    if brotli is not None and accept_encodings["br"]:
+        return "br"
+    if accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress(data, encoding, level=None):
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if level is None else level)
+    return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+
+
+class AssetPipeline:
+    """
+    Serves files from the static folder under content-hashed names ('css/style.3f2a9c1b0d4e.css')
+    with immutable cache headers and gzip/brotli variants that are compressed once, at the
+    highest level, the first time they're requested. Templates link to assets with asset_url().
+    """
+
+    def __init__(self, app=None, url_prefix="/assets"):
+        self._manifest = None
+        self._reverse = {}
+        self._variants = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, url_prefix)
+
+    def init_app(self, app, url_prefix="/assets"):
+        self.static_folder = app.static_folder
+        self.url_prefix = url_prefix
+        app.add_url_rule(f"{url_prefix}/<path:filename>", "asset", self.serve)
+        app.add_template_global(self.asset_url, "asset_url")
+        app.after_request(compress_response)
+
+    def manifest(self):
+        """Maps each logical path ('css/style.css') to its hashed path, built once per process."""
+        if self._manifest is None:
+            with self._lock:
+                if self._manifest is None:
+                    manifest = {}
+                    for root, _, files in os.walk(self.static_folder):
+                        for name in files:
+                            full_path = os.path.join(root, name)
+                            logical = os.path.relpath(full_path, self.static_folder).replace("\\", "/")
+                            with open(full_path, "rb") as f:
+                                manifest[logical] = _hashed_name(logical, f.read())
+                    self._manifest = manifest
+                    self._reverse = {hashed: logical for logical, hashed in manifest.items()}
+        return self._manifest
+
+    def asset_url(self, filename):
+        hashed = self.manifest().get(filename)
+        if hashed is None:
+            return url_for("static", filename=filename)
+        return url_for("asset", filename=hashed)
+
+    def _get_variants(self, hashed):
+        variants = self._variants.get(hashed)
+        if variants is None:
+            self.manifest()
+            logical = self._reverse.get(hashed)
+            if logical is None:
+                return None
+            with open(os.path.join(self.static_folder, logical), "rb") as f:
+                content = f.read()
+            mimetype = mimetypes.guess_type(logical)[0] or "application/octet-stream"
+            variants = {"mimetype": mimetype, None: content}
+            if mimetype in COMPRESSIBLE_MIMETYPES:
+                variants["gzip"] = compress(content, "gzip")
+                if brotli is not None:
+                    variants["br"] = compress(content, "br")
+            with self._lock:
+                self._variants[hashed] = variants
+        return variants
+
+    def serve(self, filename):
+        variants = self._get_variants(filename)
+        if variants is None:
+            abort(404)
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding not in variants:
+            encoding = None
+        response = current_app.response_class(variants[encoding], mimetype=variants["mimetype"])
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        response.vary.add("Accept-Encoding")
+        response.set_etag(filename, weak=True)
+        return response.make_conditional(request)
+
+
+def compress_response(response):
+    """
+    after_request hook: answers repeat GETs for unchanged pages with 304 Not Modified, and
+    compresses text responses on the fly for clients that accept it. Streamed responses
+    (file downloads, server-sent events) are left untouched.
+    """
+    if response.direct_passthrough or response.is_streamed or "Content-Encoding" in response.headers:
+        return response
+    if response.status_code != 200 or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    if request.method == "GET" and response.mimetype == "text/html" and not response.get_etag()[0]:
+        # A weak ETag, since the same page may be sent with different encodings.
+        response.add_etag(weak=True)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None or len(data) < MIN_COMPRESS_BYTES:
+        return response
+    # Fast settings for per-response compression; static assets use the maximum once instead.
+    response.set_data(compress(data, encoding, level=4 if encoding == "br" else 6))
+    response.headers["Content-Encoding"] = encoding
+    return response
@@ -0,0 +1,148 @@
+import concurrent.futures
+import os
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from utils.engine_planner import AdaptiveConcurrency
+from utils.repo_utils import delete_repo, update_repo_settings, get_rate_limit
+from utils.scheduler import COST_BASE_SECONDS, JobDeferred
+
+# --- Bulk operation settings (override through environment variables) ---
+BULK_MAX_REPOS = int(os.environ.get("BULK_MAX_REPOS", 100))
+BULK_MAX_PARALLEL = int(os.environ.get("BULK_MAX_PARALLEL", 4))
+# No new calls are started while fewer than this many remain in the token's rate limit window.
+BULK_RATE_LIMIT_RESERVE = int(os.environ.get("BULK_RATE_LIMIT_RESERVE", 50))
+# Pause after a rate-limit error that came without a usable reset time (secondary rate limits).
+RATE_LIMITED_PAUSE_SECONDS = 60
+# How many times one repository is retried after rate-limit errors.
+MAX_RATE_LIMIT_RETRIES = 2
+
+# Each operation is a PATCH /repos/{owner}/{repo} with these settings; None means DELETE.
+BULK_OPERATIONS = {
+    "delete": None,
+    "make_private": {"private": True},
+    "make_public": {"private": False},
+    "archive": {"archived": True},
+    "unarchive": {"archived": False},
+}
+
+
+def parse_bulk_request(data):
+    """Validates a bulk request body; returns (operation, repo_names) or raises ValueError."""
+    data = data or {}
+    operation = data.get("operation")
+    if operation not in BULK_OPERATIONS:
+        raise ValueError(f"Unknown operation. Use one of: {', '.join(BULK_OPERATIONS)}.")
+    repos = data.get("repos")
+    if not isinstance(repos, list) or not repos or not all(isinstance(name, str) and name for name in repos):
+        raise ValueError("'repos' must be a non-empty list of repository names.")
+    repos = list(dict.fromkeys(repos))
+    if len(repos) > BULK_MAX_REPOS:
+        raise ValueError(f"At most {BULK_MAX_REPOS} repositories can be changed at once.")
+    return operation, repos
+
+
+def estimate_bulk_cost(repo_count):
+    """Rough worker seconds for a bulk job, on the same scale as utils.scheduler.estimate_job_cost()."""
+    return round(COST_BASE_SECONDS + repo_count * 0.5, 1)
+
+
+def _is_rate_limited(error):
+    return "rate limit" in (error or "").lower()
+
+
+def run_bulk_repo_ops(jobs_collection, job, repo_cache):
+    """
+    Applies the job's operation to each of its repositories, a few at a time. Parallelism
+    adapts to GitHub's latency, and repositories that hit a rate limit are retried. Each result
+    is pushed to the job's 'repo_results' as it arrives, and the cached repo list is updated to
+    match. When the token's remaining rate limit drops below BULK_RATE_LIMIT_RESERVE the job is
+    deferred (JobDeferred) until the reset and later carries on with the repositories that have
+    no result yet. Returns the job result.
+    """
+    token, owner, operation = job["access_token"], job["owner"], job["operation"]
+    settings = BULK_OPERATIONS[operation]
+    repos = job["repos"]
+
+    def apply(repo_name):
+        started = time.monotonic()
+        if settings is None:
+            result = delete_repo(token, owner, repo_name)
+        else:
+            result = update_repo_settings(token, owner, repo_name, settings)
+        return result, time.monotonic() - started
+
+    def pause_seconds():
+        now = time.time()
+        pause = paused_until - now
+        limit = get_rate_limit(token)
+        if limit and limit["remaining"] <= BULK_RATE_LIMIT_RESERVE and limit["reset"] > now:
+            pause = max(pause, limit["reset"] - now + 1)
+        return max(pause, 0)
+
+    results = list(job.get("repo_results") or [])
+    done_repos = {entry["repo"] for entry in results}
+    pending = deque(repo_name for repo_name in repos if repo_name not in done_repos)
+    attempts = {}
+    in_flight = {}
+    paused_until = 0
+    concurrency = AdaptiveConcurrency(initial=min(2, BULK_MAX_PARALLEL), maximum=BULK_MAX_PARALLEL)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=BULK_MAX_PARALLEL) as executor:
+        while pending or in_flight:
+            pause = pause_seconds()
+            if pause and pending and not in_flight:
+                raise JobDeferred(
+                    datetime.utcnow() + timedelta(seconds=pause),
+                    f"Waiting {int(pause)}s for the GitHub rate limit to reset..."
+                )
+
+            while not pause and pending and len(in_flight) < concurrency.limit:
+                repo_name = pending.popleft()
+                in_flight[executor.submit(apply, repo_name)] = repo_name
+            if not in_flight:
+                continue
+
+            done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                repo_name = in_flight.pop(future)
+                result, latency = future.result()
+                if not result["success"] and _is_rate_limited(result.get("error")):
+                    concurrency.record(latency, ok=False)
+                    attempts[repo_name] = attempts.get(repo_name, 0) + 1
+                    if attempts[repo_name] <= MAX_RATE_LIMIT_RETRIES:
+                        paused_until = max(paused_until, time.time() + RATE_LIMITED_PAUSE_SECONDS)
+                        pending.append(repo_name)
+                        continue
+                else:
+                    concurrency.record(latency)
+
+                if result["success"]:
+                    if settings is None:
+                        repo_cache.remove(owner, repo_name)
+                    else:
+                        repo_cache.update(owner, repo_name, settings)
+                entry = {"repo": repo_name, "success": result["success"], "error": result.get("error")}
+                results.append(entry)
+                jobs_collection.update_one(
+                    {"_id": job["_id"]},
+                    {
+                        "$set": {"progress": {
+                            "step": f"Processed {len(results)} of {len(repos)} repositories...",
+                            "percentage": int(len(results) / len(repos) * 100),
+                        }},
+                        "$push": {"repo_results": entry},
+                    }
+                )
+
+    failed = sum(1 for entry in results if not entry["success"])
+    return {
+        "success": failed == 0,
+        "error": f"{failed} of {len(repos)} repositories could not be changed." if failed else None,
+        "operation": operation,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+        "concurrency": concurrency.summary(),
+    }
@@ -0,0 +1,66 @@
+import os
+import threading
+
+# Projects at or below both limits are uploaded through the Git Data API, which avoids the
+# subprocess and pack overhead of a git push. Anything bigger is pushed with git.
+API_ENGINE_MAX_FILES = int(os.environ.get("API_ENGINE_MAX_FILES", 300))
+API_ENGINE_MAX_BYTES = int(os.environ.get("API_ENGINE_MAX_BYTES", 5 * 1024 * 1024))
+
+
+def plan_upload_engine(zip_stats):
+    """
+    Chooses the upload engine for a job from its zip stats (see utils.zip_inspect.scan_zip).
+    Returns {"engine": "api" | "git", "reason": "..."}.
+    """
+    entries = zip_stats.get("entries", 0)
+    total_bytes = zip_stats.get("uncompressed_bytes", 0)
+    if entries > API_ENGINE_MAX_FILES:
+        return {"engine": "git", "reason": f"{entries} files is more than the API engine limit of {API_ENGINE_MAX_FILES}"}
+    if total_bytes > API_ENGINE_MAX_BYTES:
+        return {"engine": "git", "reason": f"{total_bytes} bytes is more than the API engine limit of {API_ENGINE_MAX_BYTES}"}
+    return {"engine": "api", "reason": f"small project ({entries} files, {total_bytes} bytes)"}
+
+
+class AdaptiveConcurrency:
+    """
+    Tunes how many requests run in parallel from observed latency (additive increase,
+    multiplicative decrease). The limit grows by one after each window of fast responses
+    and is halved when latency climbs well above the best seen or a request fails,
+    which is what rate limiting and retries by 'backoff' look like from here.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=16, slowdown_factor=2.0):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.slowdown_factor = slowdown_factor
+        self.peak_limit = initial
+        self._baseline = None
+        self._average = None
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency, ok=True):
+        with self._lock:
+            if not ok:
+                self._decrease()
+                return
+            self._baseline = latency if self._baseline is None else min(self._baseline, latency)
+            self._average = latency if self._average is None else 0.8 * self._average + 0.2 * latency
+            if self._average > self._baseline * self.slowdown_factor:
+                self._decrease()
+                # Start measuring afresh at the new level so one slow spell doesn't keep halving it.
+                self._average = self._baseline
+                return
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self.peak_limit = max(self.peak_limit, self.limit)
+                self._successes = 0
+
+    def _decrease(self):
+        self.limit = max(self.minimum, self.limit // 2)
+        self._successes = 0
+
+    def summary(self):
+        return {"final_limit": self.limit, "peak_limit": self.peak_limit}
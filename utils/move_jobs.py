@@ -0,0 +1,183 @@
+import os
+import posixpath
+from datetime import datetime, timedelta
+
+from utils.repo_utils import (
+    get_head_sha, get_repo_tree_paths, get_repo_contents, get_file_blob,
+    create_new_file_with_content, delete_file, get_rate_limit,
+)
+from utils.scheduler import COST_BASE_SECONDS, JobDeferred
+
+# --- Move/copy job settings (override through environment variables) ---
+# Every file costs a few GitHub calls and one commit, so very large moves are refused up front.
+MOVE_MAX_FILES = int(os.environ.get("MOVE_MAX_FILES", 1000))
+# A move job that hasn't reported progress for this long is assumed to belong to a crashed
+# worker and is queued again; it resumes from its last completed file.
+MOVE_JOB_STALE_SECONDS = int(os.environ.get("MOVE_JOB_STALE_SECONDS", 300))
+# No new file is started while fewer than this many calls remain in the token's rate limit window.
+MOVE_RATE_LIMIT_RESERVE = int(os.environ.get("MOVE_RATE_LIMIT_RESERVE", 20))
+
+MOVE_OPERATIONS = ("cut", "copy")
+
+
+def parse_move_request(data):
+    """Validates a move request body; returns (source_paths, destination_path, operation) or raises ValueError."""
+    data = data or {}
+    source_path = data.get("source_path")  # A single path or a list of paths
+    source_paths = source_path if isinstance(source_path, list) else [source_path]
+    source_paths = [path.strip("/") for path in source_paths if isinstance(path, str) and path.strip("/")]
+    operation = data.get("operation")
+    if not source_paths or operation not in MOVE_OPERATIONS:
+        raise ValueError("Missing source path or operation type.")
+    destination_path = data.get("destination_path") or ""
+    if not isinstance(destination_path, str):
+        raise ValueError("'destination_path' must be a folder path.")
+    return list(dict.fromkeys(source_paths)), destination_path.strip("/"), operation
+
+
+def estimate_move_cost(file_count):
+    """Rough worker seconds for a move job, on the same scale as utils.scheduler.estimate_job_cost()."""
+    return round(COST_BASE_SECONDS + file_count * 1.5, 1)
+
+
+def _walk_files(token, owner, repo_name, path):
+    """Lists the files under 'path' folder by folder, for trees too big for one recursive listing."""
+    result = get_repo_contents(token, owner, repo_name, path)
+    if not result["success"]:
+        raise RuntimeError(result["error"])
+    contents = result["contents"]
+    if isinstance(contents, dict):
+        return [contents["path"]] if contents.get("type") == "file" else []
+    files = []
+    for item in contents:
+        if item["type"] == "dir":
+            files.extend(_walk_files(token, owner, repo_name, item["path"]))
+        elif item["type"] == "file":
+            files.append(item["path"])
+    return files
+
+
+def plan_move_items(token, owner, repo_name, source_paths, destination_path):
+    """
+    Expands the selected files and folders into one {"source", "target"} item per file, using
+    a single recursive tree listing. Returns {"success": True, "items": [...]} or an error result.
+    """
+    head = get_head_sha(token, owner, repo_name)
+    if not head["success"]:
+        return head
+    tree = get_repo_tree_paths(token, owner, repo_name, head["sha"])
+    if not tree["success"]:
+        return tree
+    all_paths = set(tree["paths"])
+
+    items = []
+    for source in source_paths:
+        if tree["truncated"]:
+            try:
+                files = _walk_files(token, owner, repo_name, source)
+            except RuntimeError as e:
+                return {"success": False, "error": f"Could not list '{source}': {e}"}
+        elif source in all_paths:
+            files = [source]
+        else:
+            files = sorted(path for path in all_paths if path.startswith(source + "/"))
+        if not files:
+            return {"success": False, "error": f"'{source}' was not found in the repository."}
+        new_root = posixpath.join(destination_path, posixpath.basename(source))
+        if new_root == source or new_root.startswith(source + "/"):
+            return {"success": False, "error": f"Cannot move or copy '{source}' into itself."}
+        items.extend({"source": path, "target": new_root + path[len(source):]} for path in files)
+
+    if len(items) > MOVE_MAX_FILES:
+        return {"success": False, "error": f"At most {MOVE_MAX_FILES} files can be moved or copied at once ({len(items)} selected)."}
+    return {"success": True, "items": items}
+
+
+def _move_item(token, owner, repo_name, item, operation):
+    """
+    Copies one file to its target and, for 'cut', deletes the original. Safe to run again for an
+    item that was interrupted part-way: a target holding the same blob counts as already copied.
+    """
+    name = posixpath.basename(item["source"])
+    source = get_file_blob(token, owner, repo_name, item["source"])
+    target = get_repo_contents(token, owner, repo_name, item["target"])
+    target_sha = target["contents"].get("sha") if target["success"] and isinstance(target["contents"], dict) else None
+
+    if not source["success"]:
+        # The original of an interrupted 'cut' may already be gone, once its copy exists.
+        if operation == "cut" and target_sha:
+            return {"success": True}
+        return source
+
+    if target_sha is None:
+        created = create_new_file_with_content(
+            token, owner, repo_name, item["target"], source["content_b64"], f"feat: Copy '{name}'"
+        )
+        if not created["success"]:
+            return created
+    elif target_sha != source["sha"]:
+        return {"success": False, "error": f"'{item['target']}' already exists."}
+
+    if operation == "cut":
+        return delete_file(token, owner, repo_name, item["source"], source["sha"], f"feat: Move '{name}' (delete original)")
+    return {"success": True}
+
+
+def run_move_job(jobs_collection, job, repo_cache=None):
+    """
+    Moves or copies the job's files one at a time. The file list is planned once and stored on
+    the job with a 'cursor' that advances after every completed file, so a job picked up again
+    after an interruption, or after being deferred while the GitHub rate limit is exhausted,
+    carries on where it stopped. Returns the job result.
+    """
+    token, owner, repo_name, operation = job["access_token"], job["owner"], job["repo_name"], job["operation"]
+    verb = "Moving" if operation == "cut" else "Copying"
+
+    def update(fields):
+        fields["heartbeat_at"] = datetime.utcnow()
+        jobs_collection.update_one({"_id": job["_id"]}, {"$set": fields})
+
+    items = job.get("items")
+    if items is None:
+        update({"progress": {"step": "Listing files...", "percentage": 0}})
+        plan = plan_move_items(token, owner, repo_name, job["source_paths"], job["destination_path"])
+        if not plan["success"]:
+            return plan
+        items = plan["items"]
+        update({"items": items, "cursor": 0, "cost": estimate_move_cost(len(items))})
+
+    for index in range(job.get("cursor", 0), len(items)):
+        limit = get_rate_limit(token)
+        if limit and limit["remaining"] <= MOVE_RATE_LIMIT_RESERVE:
+            # The cursor is already saved, so the job can wait in the queue and resume from here.
+            not_before = datetime.utcfromtimestamp(limit["reset"] + 1)
+            raise JobDeferred(not_before, f"Waiting until {not_before:%H:%M} UTC for the GitHub rate limit to reset...")
+
+        item = items[index]
+        update({"progress": {
+            "step": f"{verb} {item['source']} ({index + 1} of {len(items)})...",
+            "percentage": int(index / len(items) * 100),
+        }})
+        result = _move_item(token, owner, repo_name, item, operation)
+        if not result["success"]:
+            return {
+                "success": False,
+                "error": f"Stopped at '{item['source']}' after {index} of {len(items)} files: {result['error']}",
+                "completed": index,
+                "files": len(items),
+            }
+        update({"cursor": index + 1})
+
+    update({"progress": {"step": "Done.", "percentage": 100}})
+    return {"success": True, "operation": operation, "completed": len(items), "files": len(items)}
+
+
+def requeue_stale_move_jobs(jobs_collection):
+    """Queues move jobs again whose worker stopped reporting progress, so they resume from their cursor."""
+    cutoff = datetime.utcnow() - timedelta(seconds=MOVE_JOB_STALE_SECONDS)
+    result = jobs_collection.update_many(
+        {"type": "move_copy", "status": "processing", "heartbeat_at": {"$lt": cutoff}},
+        {"$set": {"status": "queued", "progress.step": "Interrupted, waiting to resume..."}}
+    )
+    if result.modified_count:
+        print(f"Requeued {result.modified_count} interrupted move job(s).")
@@ -0,0 +1,212 @@
+import bisect
+import heapq
+import os
+import re
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+# --- Path index cache settings (override through environment variables) ---
+# Total estimated size of all cached indexes; the least recently used repositories are dropped first.
+PATH_INDEX_MAX_BYTES = int(os.environ.get("PATH_INDEX_MAX_BYTES", 64 * 1024 * 1024))
+# How long an index is trusted before the repository's head commit is checked again.
+PATH_INDEX_RECHECK_SECONDS = float(os.environ.get("PATH_INDEX_RECHECK_SECONDS", 30))
+
+# Fuzzy (subsequence) matching scans the whole index, so it stops once this many paths matched.
+MAX_FUZZY_MATCHES = 5000
+# One- and two-character queries have no trigram to narrow them down and match most paths of a
+# large repository, so only the first this many matching paths (in sorted order) are ranked.
+MAX_SHORT_QUERY_MATCHES = 2000
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _lower_same_length(path):
+    lowered = path.lower()
+    if len(lowered) == len(path):
+        return lowered
+    # A few characters ('İ') lowercase to two, which would break the shared offsets.
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in path)
+
+
+class PathIndex:
+    """
+    Every file path of one repository at one commit, searchable with fuzzy "go to file" queries.
+
+    The paths are stored sorted and joined into two newline-separated strings (as given and
+    lowercased) with an array of start offsets, instead of one Python string per path. Each
+    lowercase trigram maps to an array of the path numbers containing it, so a substring query only
+    checks the paths that share its rarest trigram. Queries that aren't a substring of any path fall
+    back to an in-order character match ('rputl' finds 'repo_utils.py'), which scans every path.
+    """
+
+    def __init__(self, paths, head_sha=None, truncated=False):
+        # Git allows newlines in file names, but they can't be represented here (or typed in a query).
+        paths = sorted(path for path in set(paths) if "\n" not in path)
+        self.head_sha = head_sha
+        self.truncated = truncated
+        self._text = "\n".join(paths) + "\n"
+        self._lowered = "\n".join(_lower_same_length(path) for path in paths) + "\n"
+        self._offsets = array("I", [0])
+        postings = {}
+        for number, path in enumerate(self._lowered[:-1].split("\n") if paths else []):
+            self._offsets.append(self._offsets[-1] + len(path) + 1)
+            for gram in _trigrams(path):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array("I")
+                posting.append(number)
+        self._postings = postings
+        self.nbytes = (
+            sys.getsizeof(self._text) + sys.getsizeof(self._lowered) + sys.getsizeof(self._offsets)
+            + sys.getsizeof(postings) + sum(sys.getsizeof(gram) + sys.getsizeof(posting) for gram, posting in postings.items())
+        )
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def path(self, number):
+        return self._text[self._offsets[number]:self._offsets[number + 1] - 1]
+
+    def _path_number(self, offset):
+        return bisect.bisect_right(self._offsets, offset) - 1
+
+    def _contains(self, number, needle):
+        return self._lowered.find(needle, self._offsets[number], self._offsets[number + 1] - 1) != -1
+
+    def _substring_matches(self, needle):
+        grams = _trigrams(needle)
+        if not grams:
+            # One or two characters: scan the paths in order, jumping to the next path after each
+            # match, until MAX_SHORT_QUERY_MATCHES paths matched.
+            numbers = []
+            position = self._lowered.find(needle)
+            while position != -1 and len(numbers) < MAX_SHORT_QUERY_MATCHES:
+                number = self._path_number(position)
+                numbers.append(number)
+                position = self._lowered.find(needle, self._offsets[number + 1])
+            return numbers
+        postings = [self._postings.get(gram) for gram in grams]
+        if not all(postings):
+            return []
+        rarest = min(postings, key=len)
+        if len(needle) == 3:
+            return rarest
+        return [number for number in rarest if self._contains(number, needle)]
+
+    def _substring_score(self, number, needle):
+        start, end = self._offsets[number], self._offsets[number + 1] - 1
+        name_start = self._lowered.rfind("/", start, end) + 1 or start
+        if end - name_start == len(needle) and self._lowered.startswith(needle, name_start):
+            score = 4000
+        elif self._lowered.startswith(needle, name_start):
+            score = 3000
+        elif self._lowered.find(needle, name_start, end) != -1:
+            score = 2000
+        else:
+            score = 1000
+        # Shorter paths first, so 'app.py' beats 'vendor/lib/app.py'.
+        return score - (end - start)
+
+    def _fuzzy_matches(self, needle):
+        # 'abc' -> 'a[^\nb]*b[^\nc]*c': each step jumps to the next occurrence of the next character,
+        # so the pattern can't backtrack badly and never crosses into the next path.
+        pattern = re.escape(needle[0]) + "".join(f"[^\\n{re.escape(c)}]*{re.escape(c)}" for c in needle[1:])
+        matches = {}
+        for match in re.finditer(pattern, self._lowered):
+            number = self._path_number(match.start())
+            if number in matches:
+                continue
+            start, end = self._offsets[number], self._offsets[number + 1] - 1
+            in_name = match.start() > self._lowered.rfind("/", start, end)
+            # Tighter matches, matches within the file name and shorter paths rank first.
+            matches[number] = (500 if in_name else 0) - 10 * (match.end() - match.start()) - (end - start)
+            if len(matches) >= MAX_FUZZY_MATCHES:
+                break
+        return matches
+
+    def search(self, query, limit=20):
+        """
+        Returns up to 'limit' paths containing 'query', best first; if none does, paths containing
+        its characters in order. Whitespace and case are ignored.
+        """
+        needle = _lower_same_length("".join(query.split()))
+        if not needle or not len(self):
+            return []
+        matches = self._substring_matches(needle)
+        if matches:
+            best = heapq.nlargest(limit, matches, key=lambda n: (self._substring_score(n, needle), -n))
+        else:
+            fuzzy = self._fuzzy_matches(needle)
+            best = heapq.nlargest(limit, fuzzy, key=lambda n: (fuzzy[n], -n))
+        return [self.path(number) for number in best]
+
+
+class PathIndexCache:
+    """
+    A memory-bounded LRU of PathIndex objects keyed by (owner, repo). An index is rebuilt when
+    the repository's head commit changes; the head is checked at most every 'recheck_seconds'.
+    """
+
+    def __init__(self, max_bytes=PATH_INDEX_MAX_BYTES, recheck_seconds=PATH_INDEX_RECHECK_SECONDS):
+        self.max_bytes = max_bytes
+        self.recheck_seconds = recheck_seconds
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _put(self, key, index):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old["index"].nbytes
+            if index.nbytes > self.max_bytes:
+                # Bigger than the whole budget: serve it for this request but don't keep it.
+                return
+            self._entries[key] = {"index": index, "checked_at": time.monotonic()}
+            self._bytes += index.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted["index"].nbytes
+
+    def mark_stale(self, key):
+        """Forces a head check on the next lookup, e.g. after this app committed to the repository."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["checked_at"] = float("-inf")
+
+    def get_or_build(self, key, fetch_head_sha, fetch_paths):
+        """
+        Returns {"success": True, "index": PathIndex} for 'key'. fetch_head_sha() and
+        fetch_paths(sha) are the GitHub calls to make when the cached index may be out of date;
+        their error results are returned unchanged.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and time.monotonic() - entry["checked_at"] < self.recheck_seconds:
+            return {"success": True, "index": entry["index"]}
+
+        head = fetch_head_sha()
+        if not head["success"]:
+            return head
+        if entry is not None and entry["index"].head_sha == head["sha"]:
+            entry["checked_at"] = time.monotonic()
+            return {"success": True, "index": entry["index"]}
+
+        tree = fetch_paths(head["sha"])
+        if not tree["success"]:
+            return tree
+        index = PathIndex(tree["paths"], head_sha=head["sha"], truncated=tree.get("truncated", False))
+        self._put(key, index)
+        return {"success": True, "index": index}
+
+    def stats(self):
+        with self._lock:
+            return {"repos": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
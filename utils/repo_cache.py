@@ -0,0 +1,65 @@
+import os
+from datetime import datetime, timedelta
+
+# How long a user's repository list is served from the cache before it's fetched from GitHub again.
+REPO_CACHE_TTL_SECONDS = int(os.environ.get("REPO_CACHE_TTL_SECONDS", 120))
+
+# Only these fields of each GitHub repository are used by the dashboard and analytics.
+REPO_FIELDS = ("name", "description", "language", "stargazers_count", "updated_at", "html_url", "private", "archived")
+
+
+def compact_repo(repo):
+    return {field: repo.get(field) for field in REPO_FIELDS}
+
+
+class RepoCache:
+    """
+    Caches each user's repository list in MongoDB, one document per user:
+    {"_id": login, "repos": [...], "expires_at": ...}.
+
+    Changes made through the app (deletes, visibility and archive changes) are applied to
+    the cached list in place, so it stays correct without another round of GitHub calls.
+    """
+
+    def __init__(self, get_collection, ttl_seconds=REPO_CACHE_TTL_SECONDS):
+        self.get_collection = get_collection
+        self.ttl_seconds = ttl_seconds
+        self._indexes_ready = False
+
+    def _collection(self):
+        collection = self.get_collection()
+        if not self._indexes_ready:
+            # MongoDB removes documents automatically once 'expires_at' has passed.
+            collection.create_index("expires_at", expireAfterSeconds=0)
+            self._indexes_ready = True
+        return collection
+
+    def get(self, owner, fetch_repos):
+        """Returns the owner's repositories, calling fetch_repos() when there's no fresh cached list."""
+        collection = self._collection()
+        cached = collection.find_one({"_id": owner, "expires_at": {"$gt": datetime.utcnow()}})
+        if cached:
+            return cached["repos"]
+        repos = [compact_repo(repo) for repo in fetch_repos()]
+        # get_user_repos() returns [] on errors too, so an empty list isn't worth keeping.
+        if repos:
+            collection.replace_one(
+                {"_id": owner},
+                {"_id": owner, "repos": repos, "expires_at": datetime.utcnow() + timedelta(seconds=self.ttl_seconds)},
+                upsert=True
+            )
+        return repos
+
+    def update(self, owner, repo_name, fields):
+        """Applies changed fields (e.g. {"private": True}) to one cached repository."""
+        self._collection().update_one(
+            {"_id": owner, "repos.name": repo_name},
+            {"$set": {f"repos.$.{field}": value for field, value in fields.items()}}
+        )
+
+    def remove(self, owner, repo_name):
+        self._collection().update_one({"_id": owner}, {"$pull": {"repos": {"name": repo_name}}})
+
+    def invalidate(self, owner):
+        """Drops the owner's cached list, e.g. after a new repository was created."""
+        self._collection().delete_one({"_id": owner})
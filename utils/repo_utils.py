@@ -1,23 +1,52 @@
 import os
-import zipfile
 import base64
+import hashlib
+import threading
 import requests
 import time
-import shutil
-import tempfile
-import concurrent.futures
-import glob
 import re
 
-# New imports for the Git command-line function
-import subprocess
-import stat
-
 # This library will handle automatic retries on API failures.
 import backoff
 
-# Centralized API URL for maintainability
-GITHUB_API_URL = "https://api.github.com"
+from utils import tracing
+
+# zipfile, subprocess, concurrent.futures and friends are only needed by the upload engines,
+# which run in the worker. They are imported inside those functions to keep web startup fast.
+
+# Centralized API URL for maintainability (overridable, e.g. to point the load test at a fake GitHub)
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+
+# The latest X-RateLimit-* figures GitHub sent for each token, so long-running jobs can pace themselves.
+# Keyed by a hash of the token so access tokens aren't kept around; entries are dropped once their window resets.
+_rate_limits = {}
+_rate_limits_lock = threading.Lock()
+
+
+def _token_key(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _note_rate_limit(token, headers):
+    remaining, reset = headers.get("X-RateLimit-Remaining"), headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None:
+        return
+    key = _token_key(token)
+    with _rate_limits_lock:
+        if key not in _rate_limits:
+            now = time.time()
+            for expired in [k for k, limit in _rate_limits.items() if limit["reset"] <= now]:
+                del _rate_limits[expired]
+        _rate_limits[key] = {"remaining": int(remaining), "reset": int(reset)}
+
+
+def get_rate_limit(token):
+    """Returns {"remaining", "reset"} (a Unix timestamp) from the last GitHub response for 'token', or None."""
+    with _rate_limits_lock:
+        limit = _rate_limits.get(_token_key(token))
+    if limit is None or limit["reset"] <= time.time():
+        return None
+    return limit
 
 
 def is_retryable_error(e):
@@ -31,22 +60,30 @@ def is_retryable_error(e):
         return is_rate_limit or is_server_error
     return True
 
+def _github_api_request(method, url, token, json_data=None, success_status_code=None):
+    """
+    A centralized helper function to make authenticated requests to the GitHub API.
+    Each call (including its retries) is recorded in the current request's trace.
+    """
+    with tracing.github_call(method, url):
+        return _github_api_request_with_retries(method, url, token, json_data, success_status_code)
+
 @backoff.on_exception(
     backoff.expo,
     requests.exceptions.RequestException,
     max_tries=5,
-    giveup=lambda e: not is_retryable_error(e)
+    giveup=lambda e: not is_retryable_error(e),
+    on_backoff=tracing.note_retry
 )
-def _github_api_request(method, url, token, json_data=None, success_status_code=None):
-    """
-    A centralized helper function to make authenticated requests to the GitHub API.
-    """
+def _github_api_request_with_retries(method, url, token, json_data=None, success_status_code=None):
     headers = {
         "Authorization": f"token {token}",
         "Accept": "application/vnd.github.v3+json",
     }
     try:
         response = requests.request(method, url, headers=headers, json=json_data, timeout=30.0)
+        tracing.note_status(response.status_code)
+        _note_rate_limit(token, response.headers)
         if success_status_code and response.status_code == success_status_code:
             return {"success": True, "data": None}
         response.raise_for_status()
@@ -63,34 +100,57 @@ def _github_api_request(method, url, token, json_data=None, success_status_code=
         raise e
 
 
-def create_repo_from_zip_with_git(access_token, zip_filepath, repo_name, is_private, jobs_collection, job_id):
+def _start_phase_timer(metrics):
+    """
+    Returns an 'end_phase(name)' function that records the seconds since the previous
+    phase ended into metrics["timings"]. Does nothing useful when 'metrics' is None.
+    """
+    timings = metrics.setdefault("timings", {}) if metrics is not None else {}
+    last_mark = [time.monotonic()]
+
+    def end_phase(name):
+        now = time.monotonic()
+        timings[name] = round(now - last_mark[0], 3)
+        last_mark[0] = now
+
+    return end_phase
+
+
+def create_repo_from_zip_with_git(access_token, zip_file, repo_name, is_private, jobs_collection, job_id, metrics=None, upload_options=None):
     """
     Creates a GitHub repository using Git commands. 
     This version includes the 'is_private' flag and user-friendly error handling for secrets.
+    'zip_file' may be a path or a seekable binary file object (e.g. a stream from the upload store).
+    Per-phase timings and extraction resource usage are written to 'metrics' when a dict is passed.
+    'upload_options' carries the ignore patterns and folder to strip that the user confirmed.
     """
     
+    import shutil
+    import subprocess
+    import tempfile
+    import zipfile
+    from utils.zip_inspect import extract_zip
+
     def update_progress(step, percentage):
         print(f"Job {job_id}: {step}")
         jobs_collection.update_one({"_id": job_id}, {"$set": {"progress": {"step": step, "percentage": percentage}}})
 
-    IGNORE_PATTERNS = [
-        'node_modules', '__pycache__', 'venv', 'env', '.DS_Store',
-        'Thumbs.db', '*.pyc', 'dist', 'build', '*.log'
-    ]
+    upload_options = upload_options or {}
     tmpdir = tempfile.mkdtemp()
+    end_phase = _start_phase_timer(metrics)
     
     try:
         update_progress("Preparing project...", 10)
         repo_name = re.sub(r'[\s/\\?%*:|"<>]', '-', repo_name)
-        with zipfile.ZipFile(zip_filepath, 'r') as zip_ref:
-            zip_ref.extractall(tmpdir)
-        for pattern in IGNORE_PATTERNS:
-            for path in glob.glob(os.path.join(tmpdir, '**', pattern), recursive=True):
-                try:
-                    if os.path.isdir(path): shutil.rmtree(path)
-                    elif os.path.isfile(path): os.remove(path)
-                except OSError: pass
+        # Ignored files are skipped during extraction rather than deleted afterwards.
+        with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+            resource_usage = extract_zip(
+                zip_ref, tmpdir, upload_options.get("ignore_patterns"), upload_options.get("strip_prefix", "")
+            )
+        if metrics is not None:
+            metrics["resource_usage"] = resource_usage
         update_progress("Project files extracted and cleaned.", 25)
+        end_phase("extract")
 
         update_progress("Initializing local Git repository...", 40)
         subprocess.run(["git", "init"], check=True, cwd=tmpdir, capture_output=True)
@@ -98,6 +158,7 @@ def create_repo_from_zip_with_git(access_token, zip_filepath, repo_name, is_priv
         subprocess.run(["git", "config", "user.name", "ProjectPusher Bot"], check=True, cwd=tmpdir)
         subprocess.run(["git", "config", "user.email", "bot@example.com"], check=True, cwd=tmpdir)
         subprocess.run(["git", "commit", "-m", "feat: Initial project upload"], check=True, cwd=tmpdir, capture_output=True)
+        end_phase("commit")
 
         update_progress("Creating remote repository on GitHub...", 60)
         user_response = _github_api_request("GET", f"{GITHUB_API_URL}/user", access_token)
@@ -110,6 +171,7 @@ def create_repo_from_zip_with_git(access_token, zip_filepath, repo_name, is_priv
         }
         repo_creation_response = _github_api_request("POST", f"{GITHUB_API_URL}/user/repos", access_token, json_data=repo_data)
         repo_url = repo_creation_response["data"]["html_url"]
+        end_phase("create_repo")
         
         update_progress("Pushing files to GitHub...", 80)
         remote_url = f"https://{access_token}@{repo_url.replace('https://', '')}.git"
@@ -141,6 +203,7 @@ def create_repo_from_zip_with_git(access_token, zip_filepath, repo_name, is_priv
             else:
                 raise e
 
+        end_phase("push")
         update_progress("Upload complete!", 100)
         return {"success": True, "repo_url": repo_url, "repo_name": repo_name}
 
@@ -161,22 +224,34 @@ def create_repo_from_zip_with_git(access_token, zip_filepath, repo_name, is_priv
             shutil.rmtree(tmpdir, onerror=on_rm_error)
 
 
-# --- ORIGINAL API-BASED FUNCTION (kept for reference) ---
-def create_repo_from_zip(access_token, zip_filepath, repo_name, is_private, jobs_collection, job_id):
+# --- API-BASED FUNCTION (picked by utils.engine_planner for small projects) ---
+def create_repo_from_zip(access_token, zip_file, repo_name, is_private, jobs_collection, job_id, metrics=None, upload_options=None):
     """
-    (Legacy) Creates a GitHub repository via the API. Not recommended for large projects.
+    Creates a GitHub repository via the Git Data API. Faster than a git push for small projects,
+    not recommended for large ones. Blob uploads run with adaptive concurrency tuned from
+    observed latency; timings, extraction resource usage and the concurrency reached are
+    written to 'metrics' when given. 'upload_options' is as for create_repo_from_zip_with_git().
+    The result matches the git engine: every extracted file (empty ones included) in a single
+    root commit on the branch GitHub created, with nothing added by ProjectPusher.
     """
-    IGNORE_PATTERNS = [
-        'node_modules', '__pycache__', 'venv', 'env', '.DS_Store',
-        'Thumbs.db', '*.pyc', 'dist', 'build'
-    ]
-    DEFAULT_GITIGNORE_CONTENT = "# Standard gitignore file created by ProjectPusher\n\nnode_modules/\nvenv/\nenv/\n__pycache__/\n*.pyc\nbuild/\ndist/\n.DS_Store\n*.log\n"
+    import concurrent.futures
+    import shutil
+    import tempfile
+    import zipfile
+    from utils.engine_planner import AdaptiveConcurrency
+    from utils.zip_inspect import extract_zip
+
+    upload_options = upload_options or {}
 
     def update_progress(step, percentage):
         print(f"Job {job_id}: {step}")
         jobs_collection.update_one({"_id": job_id}, {"$set": {"progress": {"step": step, "percentage": percentage}}})
 
+    def on_rm_error(func, path, exc_info):
+        pass
+
     tmpdir = tempfile.mkdtemp()
+    end_phase = _start_phase_timer(metrics)
     try:
         repo_name = re.sub(r'[\s/\\?%*:|"<>]', '-', repo_name)
         update_progress("Initializing and authenticating...", 5)
@@ -190,73 +265,87 @@ def create_repo_from_zip(access_token, zip_filepath, repo_name, is_private, jobs
         }
         repo_creation_response = _github_api_request("POST", f"{GITHUB_API_URL}/user/repos", access_token, json_data=repo_data)
         repo_url = repo_creation_response["data"]["html_url"]
+        branch = repo_creation_response["data"].get("default_branch") or "main"
+        # The Git Data API refuses to work on an empty repository, so a README commit creates the
+        # branch first. The uploaded files are committed as a new root commit that replaces it.
         update_progress("Priming repository with initial commit...", 15)
         time.sleep(1)
         readme_content = f"# {repo_name}\n\nThis repository was created by ProjectPusher."
         readme_content_b64 = base64.b64encode(readme_content.encode('utf-8')).decode('utf-8')
         prime_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/contents/README.md"
         prime_data = {"message": "feat: Initial commit", "content": readme_content_b64}
-        prime_response = _github_api_request("PUT", prime_url, access_token, json_data=prime_data)
-        parent_commit_sha = prime_response["data"]["commit"]["sha"]
+        _github_api_request("PUT", prime_url, access_token, json_data=prime_data)
+        end_phase("create_repo")
         update_progress("Extracting project files...", 20)
-        with zipfile.ZipFile(zip_filepath, 'r') as zip_ref:
-            zip_ref.extractall(tmpdir)
-        update_progress("Cleaning project directory...", 25)
-        for pattern in IGNORE_PATTERNS:
-            for path in glob.glob(os.path.join(tmpdir, '**', pattern), recursive=True):
-                try:
-                    if os.path.isdir(path): shutil.rmtree(path, onerror=on_rm_error)
-                    elif os.path.isfile(path): os.remove(path)
-                except OSError: pass
-        gitignore_path = os.path.join(tmpdir, '.gitignore')
-        if not os.path.exists(gitignore_path):
-            with open(gitignore_path, 'w') as f: f.write(DEFAULT_GITIGNORE_CONTENT)
+        with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+            resource_usage = extract_zip(
+                zip_ref, tmpdir, upload_options.get("ignore_patterns"), upload_options.get("strip_prefix", "")
+            )
+        if metrics is not None:
+            metrics["resource_usage"] = resource_usage
+        end_phase("extract")
         def create_blob(file_path, repo_path):
             with open(file_path, "rb") as f: content = f.read()
-            if not content and not repo_path.endswith('.gitkeep'): return None
             encoded_content = base64.b64encode(content).decode("utf-8")
             blob_data = {"content": encoded_content, "encoding": "base64"}
             blob_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/git/blobs"
             response = _github_api_request("POST", blob_url, access_token, json_data=blob_data)
             return {"path": repo_path, "sha": response["data"]["sha"]}
+        def timed_create_blob(file_path, repo_path):
+            started = time.monotonic()
+            return create_blob(file_path, repo_path), time.monotonic() - started
         files_to_upload = []
         for root, _, files in os.walk(tmpdir):
             for filename in files:
                 file_path = os.path.join(root, filename)
                 repo_path = os.path.relpath(file_path, tmpdir).replace("\\", "/")
-                if repo_path.upper() == 'README.MD': continue
                 files_to_upload.append((file_path, repo_path))
         if not files_to_upload:
-            update_progress("No files to upload after priming. Process complete.", 100)
-            return {"success": True, "repo_url": repo_url, "repo_name": repo_name}
+            # 'git commit' fails the same way in the git engine.
+            raise Exception("The archive has no files to upload.")
         update_progress(f"Preparing to upload {len(files_to_upload)} project files...", 30)
         tree_items = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-            future_to_blob = {executor.submit(create_blob, f[0], f[1]): f for f in files_to_upload}
-            for i, future in enumerate(concurrent.futures.as_completed(future_to_blob)):
-                try:
-                    result = future.result()
-                    if result: tree_items.append({"path": result["path"], "mode": "100644", "type": "blob", "sha": result["sha"]})
-                    percentage = 30 + int((i + 1) / len(files_to_upload) * 50)
-                    update_progress(f"Uploading file {i + 1} of {len(files_to_upload)}...", percentage)
-                except Exception as exc:
-                    raise Exception(f"Failed to create blob for a file: {exc}")
-        if not tree_items:
-            update_progress("Project contains only empty files. No new commit needed.", 100)
-            return {"success": True, "repo_url": repo_url, "repo_name": repo_name}
+        concurrency = AdaptiveConcurrency()
+        pending_files = iter(files_to_upload)
+        in_flight = set()
+        completed = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency.maximum) as executor:
+            while True:
+                # Keep as many blob uploads in flight as the current concurrency limit allows.
+                while len(in_flight) < concurrency.limit:
+                    next_file = next(pending_files, None)
+                    if next_file is None: break
+                    in_flight.add(executor.submit(timed_create_blob, next_file[0], next_file[1]))
+                if not in_flight: break
+                done, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result, latency = future.result()
+                    except Exception as exc:
+                        raise Exception(f"Failed to create blob for a file: {exc}")
+                    concurrency.record(latency)
+                    tree_items.append({"path": result["path"], "mode": "100644", "type": "blob", "sha": result["sha"]})
+                    completed += 1
+                    percentage = 30 + int(completed / len(files_to_upload) * 50)
+                    update_progress(f"Uploading file {completed} of {len(files_to_upload)}...", percentage)
+        end_phase("upload_blobs")
+        if metrics is not None:
+            metrics["concurrency"] = concurrency.summary()
         update_progress("Building repository structure...", 85)
         tree_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/git/trees"
         tree_response = _github_api_request("POST", tree_url, access_token, json_data={"tree": tree_items})
         tree_sha = tree_response["data"]["sha"]
         update_progress("Finalizing commit...", 90)
         commit_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/git/commits"
-        commit_data = {"message": "feat: Upload project files", "tree": tree_sha, "parents": [parent_commit_sha]}
+        # No parents: the priming README commit is left out of the history entirely.
+        commit_data = {"message": "feat: Initial project upload", "tree": tree_sha, "parents": []}
         commit_response = _github_api_request("POST", commit_url, access_token, json_data=commit_data)
         commit_sha = commit_response["data"]["sha"]
         update_progress("Pushing to GitHub...", 95)
-        ref_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/git/refs/heads/main"
-        ref_data = {"sha": commit_sha}
+        ref_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/git/refs/heads/{branch}"
+        ref_data = {"sha": commit_sha, "force": True}
         _github_api_request("PATCH", ref_url, access_token, json_data=ref_data)
+        end_phase("commit")
         update_progress("Done!", 100)
         return {"success": True, "repo_url": repo_url, "repo_name": repo_name}
     except Exception as e:
@@ -271,8 +360,6 @@ def create_repo_from_zip(access_token, zip_filepath, repo_name, is_private, jobs
                 print(f"Cleanup failed. Could not delete repository '{repo_name}'. Reason: {cleanup_exc}")
         return {"success": False, "error": error_message}
     finally:
-        def on_rm_error(func, path, exc_info):
-            pass
         if os.path.exists(tmpdir):
             shutil.rmtree(tmpdir, onerror=on_rm_error)
 
@@ -298,6 +385,25 @@ def get_repo_contents(token, owner, repo_name, path=""):
     except Exception as e:
         return {"success": False, "error": f"Could not list repository contents: {e}"}
 
+def get_head_sha(token, owner, repo_name):
+    commits_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/commits?per_page=1"
+    try:
+        commits = _github_api_request("GET", commits_url, token)["data"]
+        return {"success": True, "sha": commits[0]["sha"] if commits else None}
+    except Exception as e:
+        return {"success": False, "error": f"Could not get the latest commit: {e}"}
+
+def get_repo_tree_paths(token, owner, repo_name, tree_sha):
+    """Lists every file path in the repository at 'tree_sha' with a single recursive tree request."""
+    tree_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/git/trees/{tree_sha}?recursive=1"
+    try:
+        tree = _github_api_request("GET", tree_url, token)["data"]
+        paths = [item["path"] for item in tree.get("tree", []) if item.get("type") == "blob"]
+        # GitHub stops listing after 100,000 entries and says so with 'truncated'.
+        return {"success": True, "paths": paths, "truncated": tree.get("truncated", False)}
+    except Exception as e:
+        return {"success": False, "error": f"Could not list repository files: {e}"}
+
 def get_file_content(token, owner, repo_name, file_path):
     try:
         file_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/contents/{file_path}"
@@ -316,6 +422,24 @@ def get_file_content(token, owner, repo_name, file_path):
     except Exception as e:
         return {"success": False, "error": f"Could not get file content: {e}"}
 
+def get_file_blob(token, owner, repo_name, file_path):
+    """
+    Returns a file's raw content as base64 together with its blob sha. Unlike get_file_content()
+    this works for binary files, and for files over 1 MB, which the contents API leaves out.
+    """
+    try:
+        file_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/contents/{file_path}"
+        file_data = _github_api_request("GET", file_url, token)["data"]
+        if not isinstance(file_data, dict) or file_data.get("type") != "file":
+            return {"success": False, "error": f"'{file_path}' is not a file."}
+        content_b64 = "".join((file_data.get("content") or "").split())
+        if not content_b64 and file_data.get("size"):
+            blob_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/git/blobs/{file_data['sha']}"
+            content_b64 = "".join(_github_api_request("GET", blob_url, token)["data"]["content"].split())
+        return {"success": True, "content_b64": content_b64, "sha": file_data["sha"]}
+    except Exception as e:
+        return {"success": False, "error": f"Could not get file content: {e}"}
+
 def update_file_in_repo(token, owner, repo_name, file_path, new_content, commit_message, sha):
     update_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/contents/{file_path}"
     encoded_content = base64.b64encode(new_content.encode('utf-8')).decode('utf-8')
@@ -349,20 +473,33 @@ def delete_repo(token, owner, repo_name):
     except Exception as e:
         return {"success": False, "error": f"Failed to delete repository: {e}"}
 
+def update_repo_settings(token, owner, repo_name, settings):
+    """Changes repository settings, e.g. {"private": True} or {"archived": True}."""
+    repo_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}"
+    try:
+        response = _github_api_request("PATCH", repo_url, token, json_data=settings)
+        return {"success": True, "data": response["data"]}
+    except Exception as e:
+        return {"success": False, "error": f"Failed to update repository settings: {e}"}
+
 def get_repo_stats(token, owner, repo_name, stat_type="participation"):
     headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
     stats_url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/stats/{stat_type}"
-    for _ in range(5):
-        try:
-            response = requests.get(stats_url, headers=headers)
-            if response.status_code == 200:
-                return {"success": True, "data": response.json()}
-            elif response.status_code == 202:
-                time.sleep(2)
-            else:
-                response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            return {"success": False, "error": str(e), "data": []}
+    with tracing.github_call("GET", stats_url):
+        for attempt in range(5):
+            # GitHub answers 202 while it computes the stats, so every attempt after the first is a retry.
+            if attempt: tracing.note_retry()
+            try:
+                response = requests.get(stats_url, headers=headers)
+                tracing.note_status(response.status_code)
+                if response.status_code == 200:
+                    return {"success": True, "data": response.json()}
+                elif response.status_code == 202:
+                    time.sleep(2)
+                else:
+                    response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                return {"success": False, "error": str(e), "data": []}
     return {"success": True, "data": []}
 
 def get_repo_languages(token, owner, repo_name):
@@ -390,32 +527,3 @@ def create_new_file_with_content(token, owner, repo_name, file_path, content_b64
         return {"success": True}
     except Exception as e:
         return {"success": False, "error": f"Failed to create file: {e}"}
-
-def move_or_copy_item(token, owner, repo_name, source_path, destination_path, operation):
-    item_name = os.path.basename(source_path)
-    new_path = os.path.join(destination_path, item_name).replace("\\", "/")
-    if new_path.startswith(source_path + '/') or new_path == source_path:
-        return {"success": False, "error": "Cannot move an item into itself."}
-    source_info_res = get_repo_contents(token, owner, repo_name, source_path)
-    if isinstance(source_info_res.get("contents"), dict):
-        source_file = source_info_res["contents"]
-        file_content_res = get_file_content(token, owner, repo_name, source_path)
-        if not file_content_res['success']: return file_content_res
-        content_b64 = base64.b64encode(file_content_res['content'].encode('utf-8')).decode('utf-8')
-        create_res = create_new_file_with_content(token, owner, repo_name, new_path, content_b64, f"feat: Copy '{item_name}'")
-        if not create_res["success"]: return create_res
-        if operation == 'cut':
-            return delete_file(token, owner, repo_name, source_path, source_file["sha"], f"feat: Move '{item_name}' (delete original)")
-        return {"success": True}
-    elif isinstance(source_info_res.get("contents"), list):
-        for item in source_info_res["contents"]:
-            result = move_or_copy_item(token, owner, repo_name, item["path"], new_path, operation)
-            if not result["success"]: return result
-        if operation == 'cut':
-            placeholder_path = f"{source_path}/.gitkeep"
-            content_res = get_file_content(token, owner, repo_name, placeholder_path)
-            if content_res["success"]:
-                delete_file(token, owner, repo_name, placeholder_path, content_res["sha"], f"feat: Clean up folder '{source_path}'")
-        return {"success": True}
-    else:
-        return source_info_res
\ No newline at end of file
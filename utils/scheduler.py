@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+# --- Scheduler configuration (override through environment variables) ---
+# Cost is measured in estimated seconds of worker time.
+COST_BASE_SECONDS = float(os.environ.get("SCHEDULER_COST_BASE_SECONDS", 5))
+COST_BYTES_PER_SECOND = float(os.environ.get("SCHEDULER_BYTES_PER_SECOND", 2 * 1024 * 1024))
+COST_SECONDS_PER_ENTRY = float(os.environ.get("SCHEDULER_SECONDS_PER_ENTRY", 0.01))
+# How many jobs a single user may have in 'processing' at once.
+MAX_JOBS_PER_USER = int(os.environ.get("SCHEDULER_MAX_JOBS_PER_USER", 1))
+# Work started within this window counts towards a user's share.
+FAIR_SHARE_WINDOW_SECONDS = int(os.environ.get("SCHEDULER_FAIR_SHARE_WINDOW", 3600))
+# Every second a job waits lowers its effective cost by this much, so big jobs can't starve.
+AGING_PER_SECOND = float(os.environ.get("SCHEDULER_AGING_PER_SECOND", 0.1))
+# Number of worker threads/processes consuming the queue, used for wait estimates.
+WORKER_COUNT = max(1, int(os.environ.get("SCHEDULER_WORKERS", 1)))
+# Upper bound on queued jobs considered per scheduling decision.
+MAX_SCAN = 200
+# Queue positions shown to polling clients come from a snapshot of the ordering at most this old.
+QUEUE_STATUS_CACHE_SECONDS = float(os.environ.get("SCHEDULER_QUEUE_STATUS_CACHE_SECONDS", 2))
+
+_queue_snapshots = {}
+_queue_snapshot_lock = threading.Lock()
+
+
+def estimate_job_cost(zip_stats):
+    """Estimates how many seconds of worker time an upload needs, from its zip stats."""
+    return round(
+        COST_BASE_SECONDS
+        + zip_stats.get("uncompressed_bytes", 0) / COST_BYTES_PER_SECOND
+        + zip_stats.get("entries", 0) * COST_SECONDS_PER_ENTRY,
+        1
+    )
+
+
+def ensure_job_indexes(jobs_collection):
+    jobs_collection.create_index([("status", 1), ("created_at", 1)])
+    jobs_collection.create_index([("owner", 1), ("started_at", 1)])
+
+
+def _user_load(jobs_collection, now):
+    """
+    Returns {owner: {"usage": cost started recently, "running": jobs in progress}}.
+    Only jobs started within the fair-share window count, so a job orphaned by a
+    crashed worker can't block its owner forever.
+    """
+    window_start = now - timedelta(seconds=FAIR_SHARE_WINDOW_SECONDS)
+    pipeline = [
+        {"$match": {"started_at": {"$gte": window_start}}},
+        {"$group": {
+            "_id": "$owner",
+            "usage": {"$sum": {"$ifNull": ["$cost", COST_BASE_SECONDS]}},
+            "running": {"$sum": {"$cond": [{"$eq": ["$status", "processing"]}, 1, 0]}},
+        }},
+    ]
+    return {row["_id"]: row for row in jobs_collection.aggregate(pipeline)}
+
+
+def _queued_jobs(jobs_collection, now):
+    # Deferred jobs (see JobDeferred) only become eligible once their 'not_before' has passed.
+    ready = {"status": "queued", "$or": [{"not_before": None}, {"not_before": {"$lte": now}}]}
+    return list(
+        jobs_collection.find(ready, {"owner": 1, "cost": 1, "created_at": 1})
+        .sort("created_at", 1)
+        .limit(MAX_SCAN)
+    )
+
+
+def _order_queued_jobs(queued, load, now):
+    """
+    Orders queued jobs by weighted fair queuing: the next job is the one that would leave its
+    owner with the least total recent cost, minus an aging credit for time spent waiting.
+    Users with little recent usage and cheap jobs go first; heavy users take turns.
+    """
+    usage = {owner: row["usage"] for owner, row in load.items()}
+
+    def finish_tag(job):
+        cost = job.get("cost", COST_BASE_SECONDS)
+        waited = (now - job.get("created_at", now)).total_seconds()
+        return (usage.get(job.get("owner"), 0) + cost - AGING_PER_SECOND * waited, job.get("created_at", now))
+
+    remaining = list(queued)
+    ordered = []
+    while remaining:
+        best = min(remaining, key=finish_tag)
+        remaining.remove(best)
+        ordered.append(best)
+        usage[best.get("owner")] = usage.get(best.get("owner"), 0) + best.get("cost", COST_BASE_SECONDS)
+    return ordered
+
+
+def claim_next_job(jobs_collection, extra_fields=None):
+    """
+    Picks the next job fairly across users and atomically marks it 'processing'.
+    Users already at MAX_JOBS_PER_USER running jobs are skipped. Returns the job or None.
+    """
+    now = datetime.utcnow()
+    load = _user_load(jobs_collection, now)
+    for candidate in _order_queued_jobs(_queued_jobs(jobs_collection, now), load, now):
+        if load.get(candidate.get("owner"), {}).get("running", 0) >= MAX_JOBS_PER_USER:
+            continue
+        # Another worker may have claimed it in the meantime; if so, try the next candidate.
+        job = jobs_collection.find_one_and_update(
+            {"_id": candidate["_id"], "status": "queued"},
+            {"$set": {"status": "processing", "started_at": now, **(extra_fields or {})}}
+        )
+        if job:
+            return job
+    return None
+
+
+def _queue_snapshot(jobs_collection):
+    """
+    Returns {"at", "jobs": {job_id: queue status}} for the fair-share ordering of the queue,
+    recomputed at most every QUEUE_STATUS_CACHE_SECONDS. Status polls only look the job up in it.
+    """
+    with _queue_snapshot_lock:
+        key = jobs_collection.full_name
+        snapshot = _queue_snapshots.get(key)
+        if snapshot is not None and time.monotonic() - snapshot["at"] < QUEUE_STATUS_CACHE_SECONDS:
+            return snapshot
+
+        now = datetime.utcnow()
+        ordered = _order_queued_jobs(_queued_jobs(jobs_collection, now), _user_load(jobs_collection, now), now)
+        running_cost = 0
+        for job in jobs_collection.find({"status": "processing"}, {"cost": 1, "progress": 1}):
+            done = (job.get("progress") or {}).get("percentage", 0) / 100
+            running_cost += job.get("cost", COST_BASE_SECONDS) * (1 - done)
+
+        # The wait is the remaining cost of running jobs plus the cost of jobs ahead, spread across workers.
+        statuses = {}
+        ahead_cost = 0
+        for position, job in enumerate(ordered, 1):
+            statuses[job["_id"]] = {
+                "position": position,
+                "estimated_wait_seconds": int((running_cost + ahead_cost) / WORKER_COUNT),
+            }
+            ahead_cost += job.get("cost", COST_BASE_SECONDS)
+        snapshot = {"at": time.monotonic(), "jobs": statuses}
+        _queue_snapshots[key] = snapshot
+        return snapshot
+
+
+def get_queue_status(jobs_collection, job_id):
+    """
+    Returns {"position", "estimated_wait_seconds"} for a queued job, or None if it isn't queued
+    (or was queued after the current snapshot was taken, or is deferred until later).
+    """
+    return _queue_snapshot(jobs_collection)["jobs"].get(job_id)
+
+
+class JobDeferred(Exception):
+    """
+    Raised by a job handler that can't make progress until 'not_before', e.g. while the GitHub
+    rate limit is exhausted. The worker puts the job back in the queue instead of waiting, so
+    other users' jobs keep running. The handler must have saved whatever it needs to resume.
+    """
+
+    def __init__(self, not_before, step):
+        super().__init__(step)
+        self.not_before = not_before
+        self.step = step
+
+
+def defer_job(jobs_collection, job_id, not_before, step):
+    jobs_collection.update_one(
+        {"_id": job_id},
+        {"$set": {"status": "queued", "not_before": not_before, "progress.step": step}}
+    )
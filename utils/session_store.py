@@ -0,0 +1,175 @@
+import secrets
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from flask.sessions import SessionInterface, SessionMixin
+from pymongo import ReturnDocument
+from werkzeug.datastructures import CallbackDict
+
+# Only these fields of the GitHub /user response are used by the app and templates.
+USER_PROFILE_FIELDS = ("login", "avatar_url", "name")
+
+
+def compact_user_profile(user_data):
+    """
+    Trims a GitHub /user response down to the fields we actually use,
+    so the stored session stays small.
+    """
+    return {field: user_data.get(field) for field in USER_PROFILE_FIELDS}
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """A dict-like session whose data lives on the server, keyed by 'sid'."""
+
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.previous_sid = None
+        self.modified = False
+        self.accessed = False
+
+    def regenerate(self):
+        """
+        Moves the session to a fresh id when the user logs in or out, so an id planted in the
+        browser before login (session fixation) or copied from an old cookie stops working.
+        """
+        if not self.new and self.previous_sid is None:
+            self.previous_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.modified = True
+
+
+class MongoSessionInterface(SessionInterface):
+    """
+    Stores session data in a MongoDB collection and keeps only a random session id in the cookie.
+
+    Recently used sessions are held in a small in-process LRU cache together with the stored
+    document's 'version', which every save increments. Each request still checks the version
+    and expiry in MongoDB, but only reloads and decodes the data when another process changed
+    it, so a logout or a new OAuth state in one process is seen by all the others at once.
+
+    Requests under 'sessionless_paths' (static files and fingerprinted assets) get a null
+    session and never touch MongoDB.
+    """
+
+    def __init__(self, get_collection, cache_size=1024, sessionless_paths=()):
+        self.get_collection = get_collection
+        self.cache_size = cache_size
+        self.sessionless_paths = tuple(sessionless_paths)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._indexes_ready = False
+
+    # --- LRU front cache ---
+
+    def _cache_get(self, sid):
+        with self._lock:
+            entry = self._cache.get(sid)
+            if entry is not None:
+                self._cache.move_to_end(sid)
+            return entry
+
+    def _cache_set(self, sid, data, version):
+        with self._lock:
+            self._cache[sid] = (data, version)
+            self._cache.move_to_end(sid)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cache_delete(self, sid):
+        with self._lock:
+            self._cache.pop(sid, None)
+
+    # --- Mongo backing store ---
+
+    def _ensure_indexes(self, collection):
+        if not self._indexes_ready:
+            # MongoDB removes documents automatically once 'expires_at' has passed.
+            collection.create_index("expires_at", expireAfterSeconds=0)
+            self._indexes_ready = True
+
+    def _load(self, sid):
+        collection = self.get_collection()
+        cached = self._cache_get(sid)
+        if cached is not None:
+            doc = collection.find_one({"_id": sid}, {"version": 1, "expires_at": 1})
+            if not doc or doc["expires_at"] <= datetime.utcnow():
+                self._cache_delete(sid)
+                return None
+            if doc.get("version") == cached[1]:
+                return cached[0]
+        doc = collection.find_one({"_id": sid})
+        if not doc or doc["expires_at"] <= datetime.utcnow():
+            return None
+        data = doc.get("data", {})
+        self._cache_set(sid, data, doc.get("version"))
+        return data
+
+    # --- Flask SessionInterface ---
+
+    def open_session(self, app, request):
+        # Sessions are opened before the URL is matched, so these requests are recognised by path.
+        if self.sessionless_paths and request.path.startswith(self.sessionless_paths):
+            return self.make_null_session(app)
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            data = self._load(sid)
+            if data is not None:
+                return ServerSideSession(dict(data), sid=sid)
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.previous_sid:
+            # The session moved to a new id; the old one must not work anywhere anymore.
+            self._cache_delete(session.previous_sid)
+            self.get_collection().delete_one({"_id": session.previous_sid})
+
+        if not session:
+            # The session was emptied (e.g. logout): drop it from the store and the browser.
+            if session.modified and not session.new:
+                self._cache_delete(session.sid)
+                self.get_collection().delete_one({"_id": session.sid})
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if not session.modified:
+            return
+
+        data = dict(session)
+        collection = self.get_collection()
+        self._ensure_indexes(collection)
+        doc = collection.find_one_and_update(
+            {"_id": session.sid},
+            {
+                "$set": {"data": data, "expires_at": datetime.utcnow() + app.permanent_session_lifetime},
+                "$inc": {"version": 1},
+            },
+            projection={"version": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._cache_set(session.sid, data, doc["version"])
+
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
@@ -0,0 +1,111 @@
+import contextlib
+import contextvars
+import re
+import time
+from urllib.parse import urlparse
+
+# The trace for the request being handled, or None outside a traced request (e.g. in the worker).
+_current_trace = contextvars.ContextVar("github_trace", default=None)
+# The GitHub call currently in flight, so retry hooks can find it.
+_current_call = contextvars.ContextVar("github_call", default=None)
+
+# Collapse concrete URLs into endpoint templates so calls can be grouped.
+_ENDPOINT_PATTERNS = [
+    (re.compile(r"^/repos/[^/]+/[^/]+/contents(/.*)?$"), "/repos/{owner}/{repo}/contents/{path}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/refs/.+$"), "/repos/{owner}/{repo}/git/refs/{ref}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/(blobs|trees|commits)/.+$"), r"/repos/{owner}/{repo}/git/\1/{sha}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/(.+)$"), r"/repos/{owner}/{repo}/\1"),
+    (re.compile(r"^/repos/[^/]+/[^/]+$"), "/repos/{owner}/{repo}"),
+]
+
+
+def endpoint_template(url):
+    """Turns 'https://api.github.com/repos/me/app/contents/src/a.py?ref=x' into '/repos/{owner}/{repo}/contents/{path}'."""
+    path = urlparse(url).path.rstrip("/") or "/"
+    for pattern, template in _ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            return pattern.sub(template, path)
+    return path
+
+
+class GitHubTrace:
+    """Collects every GitHub API call made while handling one request."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.calls = []
+
+    def by_endpoint(self):
+        groups = {}
+        for call in self.calls:
+            key = f"{call['method']} {call['endpoint']}"
+            group = groups.setdefault(key, {"endpoint": key, "calls": 0, "retries": 0, "ms": 0.0, "statuses": {}})
+            group["calls"] += 1
+            group["retries"] += call["retries"]
+            group["ms"] = round(group["ms"] + call["ms"], 1)
+            status = str(call["status"])
+            group["statuses"][status] = group["statuses"].get(status, 0) + 1
+        return sorted(groups.values(), key=lambda group: group["ms"], reverse=True)
+
+    def summary(self):
+        return {
+            "calls": len(self.calls),
+            "retries": sum(call["retries"] for call in self.calls),
+            "ms": round(sum(call["ms"] for call in self.calls), 1),
+            "endpoints": self.by_endpoint(),
+        }
+
+    def server_timing(self, top=3):
+        """Builds a Server-Timing header value: total GitHub time, the slowest endpoints, and the whole request."""
+        summary = self.summary()
+        metrics = [f'github;desc="{summary["calls"]} calls, {summary["retries"]} retries";dur={summary["ms"]}']
+        for i, group in enumerate(summary["endpoints"][:top], start=1):
+            description = f'{group["endpoint"]} x{group["calls"]}'.replace('"', "'")
+            metrics.append(f'gh{i};desc="{description}";dur={group["ms"]}')
+        metrics.append(f"app;dur={round((time.monotonic() - self.started) * 1000, 1)}")
+        return ", ".join(metrics)
+
+
+def start_trace():
+    """Starts tracing GitHub calls for the current request. Pass the returned token to end_trace()."""
+    return _current_trace.set(GitHubTrace())
+
+
+def end_trace(token):
+    _current_trace.reset(token)
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+@contextlib.contextmanager
+def github_call(method, url):
+    """
+    Times one logical GitHub call, including any retries made inside it, and adds it to the
+    current trace. Call note_status() and note_retry() while it runs to fill in the details.
+    """
+    call = {"method": method, "endpoint": endpoint_template(url), "status": None, "retries": 0}
+    token = _current_call.set(call)
+    started = time.monotonic()
+    try:
+        yield call
+    finally:
+        _current_call.reset(token)
+        call["ms"] = round((time.monotonic() - started) * 1000, 1)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.calls.append(call)
+
+
+def note_status(status_code):
+    call = _current_call.get()
+    if call is not None:
+        call["status"] = status_code
+
+
+def note_retry(*args):
+    """Counts a retry for the call in flight. Usable directly as a 'backoff' on_backoff handler."""
+    call = _current_call.get()
+    if call is not None:
+        call["retries"] += 1
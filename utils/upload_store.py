@@ -0,0 +1,97 @@
+import os
+import stat
+import shutil
+import uuid
+
+
+def safe_file_remove(filepath):
+    """
+    Safely remove a file, handling Windows permission issues.
+    """
+    if not os.path.exists(filepath):
+        return True
+
+    try:
+        # First attempt: normal removal
+        os.remove(filepath)
+        return True
+    except (OSError, IOError):
+        try:
+            # Second attempt: clear read-only and try again
+            os.chmod(filepath, stat.S_IWRITE)
+            os.remove(filepath)
+            return True
+        except (OSError, IOError):
+            # If we still can't delete it, just log and continue
+            print(f"Warning: Could not remove temporary file: {filepath}")
+            return False
+
+
+class LocalUploadStore:
+    """
+    Keeps uploaded archives in a directory on disk.
+    Point UPLOAD_STORE_DIR at a shared volume to let workers run on other nodes.
+    """
+    name = "local"
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        # Jobs created before the upload store existed carry an absolute path as their key.
+        return os.path.join(self.directory, key)
+
+    def save(self, fileobj, filename):
+        key = f"{uuid.uuid4().hex}_{filename}"
+        with open(self._path(key), "wb") as f:
+            shutil.copyfileobj(fileobj, f)
+        return key
+
+    def open(self, key):
+        return open(self._path(key), "rb")
+
+    def delete(self, key):
+        return safe_file_remove(self._path(key))
+
+
+class GridFSUploadStore:
+    """Keeps uploaded archives in MongoDB GridFS, so any node with database access can read them."""
+    name = "gridfs"
+
+    def __init__(self, db, bucket_name="uploads"):
+        from gridfs import GridFSBucket
+        self.bucket = GridFSBucket(db, bucket_name=bucket_name)
+
+    def save(self, fileobj, filename):
+        file_id = self.bucket.upload_from_stream(filename, fileobj)
+        return str(file_id)
+
+    def open(self, key):
+        from bson import ObjectId
+        # GridOut is seekable, so zipfile can read the central directory without a local copy.
+        return self.bucket.open_download_stream(ObjectId(key))
+
+    def delete(self, key):
+        from bson import ObjectId
+        from gridfs.errors import NoFile
+        try:
+            self.bucket.delete(ObjectId(key))
+            return True
+        except NoFile:
+            return False
+
+
+def get_upload_store(db, store_name=None):
+    """
+    Returns the upload store configured by the UPLOAD_STORE environment variable
+    ('local' by default, or 'gridfs'). Jobs remember which store they were saved to,
+    so pass 'store_name' to open an existing upload.
+    """
+    store_name = store_name or os.environ.get("UPLOAD_STORE", "local")
+    if store_name == "gridfs":
+        return GridFSUploadStore(db)
+    if store_name == "local":
+        default_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tmp", "uploads")
+        return LocalUploadStore(os.environ.get("UPLOAD_STORE_DIR", default_dir))
+    raise ValueError(f"Unknown UPLOAD_STORE '{store_name}'. Use 'local' or 'gridfs'.")
@@ -0,0 +1,210 @@
+import fnmatch
+import heapq
+import os
+import time
+import zipfile
+
+# --- Ingestion limits (override through environment variables) ---
+ZIP_MAX_TOTAL_BYTES = int(os.environ.get("ZIP_MAX_TOTAL_BYTES", 500 * 1024 * 1024))
+ZIP_MAX_ENTRIES = int(os.environ.get("ZIP_MAX_ENTRIES", 50000))
+# Highest uncompressed/compressed ratio allowed for any entry of at least ZIP_RATIO_MIN_BYTES.
+ZIP_MAX_RATIO = float(os.environ.get("ZIP_MAX_RATIO", 200))
+ZIP_RATIO_MIN_BYTES = 1024 * 1024
+ZIP_MAX_PATH_DEPTH = int(os.environ.get("ZIP_MAX_PATH_DEPTH", 40))
+
+EXTRACT_CHUNK_SIZE = 64 * 1024
+
+# Files and folders that are never uploaded to GitHub. Each pattern is matched against every
+# component of an entry's path, so 'build' drops a build folder at any depth.
+IGNORE_PATTERNS = [
+    'node_modules', '__pycache__', 'venv', 'env', '.DS_Store',
+    'Thumbs.db', '*.pyc', 'dist', 'build', '*.log', '__MACOSX'
+]
+# How many of the biggest files, and of the ignored paths, an upload manifest lists.
+MANIFEST_LARGEST_FILES = 10
+MANIFEST_IGNORED_SAMPLES = 20
+
+
+class ZipLimitError(Exception):
+    """Raised when an archive breaks one of the ingestion limits or contains an unsafe path."""
+
+
+def _entry_parts(name):
+    # Archives made on Windows sometimes use backslashes as separators.
+    return [part for part in name.replace("\\", "/").split("/") if part]
+
+
+def _is_unsafe_path(name):
+    normalized = name.replace("\\", "/")
+    return normalized.startswith("/") or (len(normalized) > 1 and normalized[1] == ":") or ".." in _entry_parts(name)
+
+
+def ignored_by(parts, ignore_patterns):
+    """Returns the first pattern matching any component of a path (given as a list of parts), or None."""
+    for part in parts:
+        for pattern in ignore_patterns:
+            if fnmatch.fnmatchcase(part, pattern):
+                return pattern
+    return None
+
+
+def _split_entries(infos, ignore_patterns, strip_prefix=""):
+    """
+    Splits file entries into kept [(info, parts)] and ignored [(info, parts, pattern)], where
+    'parts' is the entry's path in the repository once 'strip_prefix' has been removed.
+    """
+    prefix_parts = _entry_parts(strip_prefix)
+    kept, ignored = [], []
+    for info in infos:
+        parts = _entry_parts(info.filename)
+        if prefix_parts and parts[:len(prefix_parts)] == prefix_parts and len(parts) > len(prefix_parts):
+            parts = parts[len(prefix_parts):]
+        pattern = ignored_by(parts, ignore_patterns)
+        if pattern is None:
+            kept.append((info, parts))
+        else:
+            ignored.append((info, parts, pattern))
+    return kept, ignored
+
+
+def _common_folder(parts_list):
+    """Returns the folder every path sits in ('project' or 'project/src'), or '' if the files aren't all nested."""
+    prefix = []
+    while parts_list and all(len(parts) > len(prefix) + 1 for parts in parts_list):
+        folder = parts_list[0][len(prefix)]
+        if any(parts[len(prefix)] != folder for parts in parts_list):
+            break
+        prefix.append(folder)
+    return "/".join(prefix)
+
+
+def _stats_from_infos(infos):
+    return {
+        "entries": len(infos),
+        "compressed_bytes": sum(info.compress_size for info in infos),
+        "uncompressed_bytes": sum(info.file_size for info in infos),
+        "max_path_depth": max((len(_entry_parts(info.filename)) for info in infos), default=0),
+        "max_ratio": round(max(
+            (info.file_size / max(info.compress_size, 1) for info in infos if info.file_size >= ZIP_RATIO_MIN_BYTES),
+            default=0
+        ), 1),
+        "unsafe_paths": [info.filename for info in infos if _is_unsafe_path(info.filename)][:5],
+    }
+
+
+def scan_zip(zip_file):
+    """
+    Reads only the zip's central directory (nothing is extracted) and returns
+    the number of file entries, their total compressed/uncompressed sizes, and
+    the figures check_zip_limits() needs. 'zip_file' may be a path or a seekable binary file object.
+    """
+    with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+        all_infos = zip_ref.infolist()
+    stats = _stats_from_infos([info for info in all_infos if not info.is_dir()])
+    stats["archive_entries"] = len(all_infos)
+    return stats
+
+
+def build_manifest(zip_file, ignore_patterns=None, strip_prefix=""):
+    """
+    Reads only the zip's central directory and describes what an upload would contain: the
+    kept and ignored entries with their sizes, the largest files, and the folder the whole
+    project is nested in, if any. 'stats' holds the scan_zip() figures for the kept entries,
+    which is what will actually be extracted, except 'archive_entries', which counts them all.
+    """
+    if ignore_patterns is None:
+        ignore_patterns = IGNORE_PATTERNS
+    with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+        all_infos = zip_ref.infolist()
+    infos = [info for info in all_infos if not info.is_dir()]
+    kept, ignored = _split_entries(infos, ignore_patterns, strip_prefix)
+
+    stats = _stats_from_infos([info for info, _ in kept])
+    stats["archive_entries"] = len(all_infos)
+    # Flag unsafe paths even in entries that won't be extracted.
+    stats["unsafe_paths"] = [info.filename for info in infos if _is_unsafe_path(info.filename)][:5]
+
+    by_pattern = {}
+    for info, _, pattern in ignored:
+        group = by_pattern.setdefault(pattern, {"pattern": pattern, "entries": 0, "bytes": 0})
+        group["entries"] += 1
+        group["bytes"] += info.file_size
+
+    return {
+        "stats": stats,
+        "ignore_patterns": list(ignore_patterns),
+        "strip_prefix": strip_prefix,
+        "total": {"entries": len(infos), "uncompressed_bytes": sum(info.file_size for info in infos)},
+        "kept": {"entries": len(kept), "uncompressed_bytes": stats["uncompressed_bytes"]},
+        "ignored": {
+            "entries": len(ignored),
+            "uncompressed_bytes": sum(info.file_size for info, _, _ in ignored),
+            # A list rather than a dict, since patterns like '*.pyc' can't be MongoDB field names.
+            "by_pattern": sorted(by_pattern.values(), key=lambda group: group["bytes"], reverse=True),
+            "samples": ["/".join(parts) for _, parts, _ in ignored[:MANIFEST_IGNORED_SAMPLES]],
+        },
+        "largest": [
+            {"path": "/".join(parts), "bytes": info.file_size}
+            for info, parts in heapq.nlargest(MANIFEST_LARGEST_FILES, kept, key=lambda entry: entry[0].file_size)
+        ],
+        "top_level_folder": _common_folder([parts for _, parts in kept]),
+    }
+
+
+def check_zip_limits(zip_stats):
+    """Raises ZipLimitError if the stats from scan_zip() break any ingestion limit."""
+    # Every entry is parsed, ignored files and folders included, so all of them count.
+    if zip_stats.get("archive_entries", 0) > ZIP_MAX_ENTRIES:
+        raise ZipLimitError(f"The archive has {zip_stats['archive_entries']} entries; the limit is {ZIP_MAX_ENTRIES}.")
+    if zip_stats.get("entries", 0) > ZIP_MAX_ENTRIES:
+        raise ZipLimitError(f"The archive has {zip_stats['entries']} files; the limit is {ZIP_MAX_ENTRIES}.")
+    if zip_stats.get("uncompressed_bytes", 0) > ZIP_MAX_TOTAL_BYTES:
+        raise ZipLimitError(
+            f"The archive expands to {zip_stats['uncompressed_bytes'] // (1024 * 1024)} MB; "
+            f"the limit is {ZIP_MAX_TOTAL_BYTES // (1024 * 1024)} MB."
+        )
+    if zip_stats.get("max_ratio", 0) > ZIP_MAX_RATIO:
+        raise ZipLimitError(f"The archive contains a file compressed {zip_stats['max_ratio']}:1, which looks like a zip bomb.")
+    if zip_stats.get("max_path_depth", 0) > ZIP_MAX_PATH_DEPTH:
+        raise ZipLimitError(f"The archive nests folders {zip_stats['max_path_depth']} levels deep; the limit is {ZIP_MAX_PATH_DEPTH}.")
+    if zip_stats.get("unsafe_paths"):
+        raise ZipLimitError(f"The archive contains unsafe paths such as '{zip_stats['unsafe_paths'][0]}'.")
+
+
+def extract_zip(zip_ref, dest_dir, ignore_patterns=None, strip_prefix=""):
+    """
+    Validates an open ZipFile against the ingestion limits, then extracts the entries not
+    matched by 'ignore_patterns' (IGNORE_PATTERNS by default) into 'dest_dir', with
+    'strip_prefix' removed from their paths. The limits are enforced again on the bytes
+    actually written, in case the central directory lies about sizes. Returns the resources used.
+    """
+    started = time.monotonic()
+    all_infos = zip_ref.infolist()
+    infos = [info for info in all_infos if not info.is_dir()]
+    kept, ignored = _split_entries(infos, IGNORE_PATTERNS if ignore_patterns is None else ignore_patterns, strip_prefix)
+    check_zip_limits({**_stats_from_infos([info for info, _ in kept]), "archive_entries": len(all_infos)})
+
+    total_written = 0
+    for info, parts in kept:
+        target_path = os.path.join(dest_dir, *parts)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        entry_written = 0
+        with zip_ref.open(info) as source, open(target_path, "wb") as target:
+            while True:
+                chunk = source.read(EXTRACT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                entry_written += len(chunk)
+                total_written += len(chunk)
+                if total_written > ZIP_MAX_TOTAL_BYTES:
+                    raise ZipLimitError(f"The archive expands to more than {ZIP_MAX_TOTAL_BYTES // (1024 * 1024)} MB.")
+                if entry_written >= ZIP_RATIO_MIN_BYTES and entry_written / max(info.compress_size, 1) > ZIP_MAX_RATIO:
+                    raise ZipLimitError(f"'{info.filename}' is compressed more than {ZIP_MAX_RATIO:g}:1, which looks like a zip bomb.")
+                target.write(chunk)
+
+    return {
+        "entries": len(kept),
+        "ignored_entries": len(ignored),
+        "bytes_written": total_written,
+        "seconds": round(time.monotonic() - started, 3),
+    }
@@ -2,35 +2,55 @@
 
 import time
 import os
-import stat
-import shutil
+from datetime import datetime, timedelta
 from pymongo import MongoClient
 from dotenv import load_dotenv
+from utils.upload_store import get_upload_store
+from utils.scheduler import claim_next_job, ensure_job_indexes, JobDeferred, defer_job
+from utils.zip_inspect import scan_zip, check_zip_limits, ZipLimitError
+from utils.engine_planner import plan_upload_engine
+from utils.repo_cache import RepoCache
+from utils.move_jobs import requeue_stale_move_jobs
 
 # Load environment variables. This is important for the thread too.
 load_dotenv()
 
-def safe_file_remove(filepath):
-    """
-    Safely remove a file, handling Windows permission issues.
-    """
-    if not os.path.exists(filepath):
-        return True
-    
+# Uploads still waiting for the user to confirm their preview after this long are discarded.
+UPLOAD_CONFIRM_TIMEOUT_SECONDS = int(os.environ.get("UPLOAD_CONFIRM_TIMEOUT_SECONDS", 3600))
+# How often an idle worker looks for such uploads and for interrupted move jobs.
+EXPIRE_CHECK_INTERVAL_SECONDS = 60
+
+def get_upload_key(job):
+    """Returns the job's key in its upload store. Older jobs only carry a local 'temp_filepath'."""
+    return job.get("upload_key") or job.get("temp_filepath")
+
+def delete_upload(jobs_collection, job):
+    """Removes a job's archive from the upload store it was saved to."""
     try:
-        # First attempt: normal removal
-        os.remove(filepath)
-        return True
-    except (OSError, IOError):
-        try:
-            # Second attempt: clear read-only and try again
-            os.chmod(filepath, stat.S_IWRITE)
-            os.remove(filepath)
-            return True
-        except (OSError, IOError):
-            # If we still can't delete it, just log and continue
-            print(f"Warning: Could not remove temporary file: {filepath}")
-            return False
+        upload_store = get_upload_store(jobs_collection.database, job.get("upload_store", "local"))
+        if upload_store.delete(get_upload_key(job)):
+            print(f"Cleaned up upload for job {job['_id']}")
+        else:
+            print(f"Partial cleanup - could not remove upload for job {job['_id']}")
+    except Exception as e:
+        print(f"Error during upload cleanup for job {job.get('_id', 'unknown')}: {e}")
+
+def expire_unconfirmed_uploads(jobs_collection):
+    """Marks uploads whose preview was never confirmed or cancelled as expired and deletes their archives."""
+    cutoff = datetime.utcnow() - timedelta(seconds=UPLOAD_CONFIRM_TIMEOUT_SECONDS)
+    stale_jobs = jobs_collection.find(
+        {"status": "awaiting_confirmation", "created_at": {"$lt": cutoff}},
+        {"upload_store": 1, "upload_key": 1}
+    )
+    for job in stale_jobs:
+        # Only the process that flips the status deletes the archive, in case the user confirms right now.
+        expired = jobs_collection.update_one(
+            {"_id": job["_id"], "status": "awaiting_confirmation"},
+            {"$set": {"status": "expired", "result": {"success": False, "error": "This upload was never confirmed and has expired."}}}
+        )
+        if expired.modified_count:
+            print(f"Job {job['_id']} expired before it was confirmed.")
+            delete_upload(jobs_collection, job)
 
 def get_mongo_collection():
     """Connects to MongoDB and returns the 'jobs' collection."""
@@ -50,6 +70,7 @@ def get_mongo_collection():
         raise
         
     db = client.get_default_database()
+    ensure_job_indexes(db.jobs)
     return db.jobs
 
 def process_jobs():
@@ -64,24 +85,47 @@ def process_jobs():
         print(f"Background worker could not start due to a setup error: {e}")
         return # Exit the thread if DB connection fails
 
-    from utils.repo_utils import create_repo_from_zip_with_git
+    from utils.repo_utils import create_repo_from_zip, create_repo_from_zip_with_git
+    from utils.bulk_ops import run_bulk_repo_ops
+    from utils.move_jobs import run_move_job
+    upload_engines = {"api": create_repo_from_zip, "git": create_repo_from_zip_with_git}
+    repo_cache = RepoCache(lambda: jobs_collection.database.repo_cache)
+    # Jobs other than uploads are run by these handlers, which return the job result.
+    job_handlers = {"bulk_repo_ops": run_bulk_repo_ops, "move_copy": run_move_job}
+    last_expire_check = 0
 
     while True:
         job = None
         try:
-            # Atomically find a 'queued' job and update its status to 'processing'.
-            job = jobs_collection.find_one_and_update(
-                {"status": "queued"},
-                {
-                    "$set": {
-                        "status": "processing",
-                        "progress": {"step": "Preparing to process...", "percentage": 0}
-                    }
-                }
+            # Pick the next job fairly across users and atomically mark it 'processing'.
+            job = claim_next_job(
+                jobs_collection,
+                {"progress": {"step": "Preparing to process...", "percentage": 0}, "heartbeat_at": datetime.utcnow()}
             )
 
             if job:
-                print(f"Worker found job {job['_id']}. Processing with Git command-line method...")
+                print(f"Worker found job {job['_id']}.")
+
+                if job.get("type", "upload") in job_handlers:
+                    try:
+                        result = job_handlers[job["type"]](jobs_collection, job, repo_cache)
+                        final_status = 'finished' if result.get('success') else 'failed'
+                        jobs_collection.update_one(
+                            {"_id": job["_id"]},
+                            {"$set": {"status": final_status, "result": result}}
+                        )
+                        print(f"Job {job['_id']} ({job['type']}) finished with status: {final_status}")
+                    except JobDeferred as deferred:
+                        # Back to the queue rather than sleeping here, so other users' jobs keep running.
+                        defer_job(jobs_collection, job["_id"], deferred.not_before, deferred.step)
+                        print(f"Job {job['_id']} ({job['type']}) deferred until {deferred.not_before}: {deferred.step}")
+                    except Exception as job_error:
+                        print(f"Error during {job['type']} job {job['_id']}: {job_error}")
+                        jobs_collection.update_one(
+                            {"_id": job["_id"]},
+                            {"$set": {"status": "failed", "result": {"success": False, "error": str(job_error)}}}
+                        )
+                    continue
 
                 try:
                     # ===================================================================
@@ -92,25 +136,57 @@ def process_jobs():
                     #    Default to False if it's not present for any reason.
                     is_private_job = job.get('is_private', False)
                     
-                    # 2. Call the updated function with the new 'is_private_job' argument.
-                    result = create_repo_from_zip_with_git(
-                        job["access_token"],
-                        job["temp_filepath"],
-                        job["repo_name"],
-                        is_private_job, # <-- The new argument is passed here
-                        jobs_collection,
-                        job["_id"]
+                    # 2. Stream the archive from the upload store it was saved to, pick the
+                    #    engine that suits its size and call it with the 'is_private_job' argument.
+                    upload_store = get_upload_store(jobs_collection.database, job.get("upload_store", "local"))
+                    with upload_store.open(get_upload_key(job)) as zip_file:
+                        # Reject archives over the ingestion limits before any extraction work starts.
+                        # Jobs confirmed from the upload preview already carry the stats of the files
+                        # they keep, so the archive is only scanned for older jobs.
+                        zip_stats = job.get("zip_stats") or scan_zip(zip_file)
+                        check_zip_limits(zip_stats)
+                        plan = plan_upload_engine(zip_stats)
+                        print(f"Job {job['_id']}: using the '{plan['engine']}' engine ({plan['reason']}).")
+                        engine_metrics = {}
+                        started_at = time.monotonic()
+                        result = upload_engines[plan["engine"]](
+                            job["access_token"],
+                            zip_file,
+                            job["repo_name"],
+                            is_private_job, # <-- The new argument is passed here
+                            jobs_collection,
+                            job["_id"],
+                            metrics=engine_metrics,
+                            upload_options=job.get("upload_options")
+                        )
+                        engine_metrics["total_seconds"] = round(time.monotonic() - started_at, 3)
+
+                    # 3. Record which engine ran, how long each phase took and what extraction used.
+                    resource_usage = engine_metrics.pop("resource_usage", None)
+                    jobs_collection.update_one(
+                        {"_id": job["_id"]},
+                        {"$set": {"engine": {**plan, **engine_metrics}, "resource_usage": resource_usage}}
                     )
                     
                     # ===================================================================
 
                     final_status = 'finished' if result.get('success') else 'failed'
+                    if result.get('success') and job.get("owner"):
+                        # The new repository isn't in the owner's cached repo list yet.
+                        repo_cache.invalidate(job["owner"])
                     jobs_collection.update_one(
                         {"_id": job["_id"]},
                         {"$set": {"status": final_status, "result": result}}
                     )
                     print(f"Job {job['_id']} finished with status: {final_status}")
 
+                except ZipLimitError as limit_error:
+                    print(f"Job {job['_id']} rejected by ingestion limits: {limit_error}")
+                    jobs_collection.update_one(
+                        {"_id": job["_id"]},
+                        {"$set": {"status": "failed", "result": {"success": False, "error": str(limit_error)}}}
+                    )
+
                 except Exception as repo_error:
                     # Handle errors from the repo creation function
                     print(f"Error during repository creation for job {job['_id']}: {repo_error}")
@@ -121,7 +197,13 @@ def process_jobs():
                     )
 
             else:
-                # If no job, wait for 5 seconds before checking again.
+                # If no job, tidy up abandoned upload previews and requeue move jobs
+                # orphaned by a crashed worker now and then, and wait for 5 seconds
+                # before checking again.
+                if time.monotonic() - last_expire_check >= EXPIRE_CHECK_INTERVAL_SECONDS:
+                    last_expire_check = time.monotonic()
+                    expire_unconfirmed_uploads(jobs_collection)
+                    requeue_stale_move_jobs(jobs_collection)
                 time.sleep(5)
 
         except Exception as e:
@@ -138,14 +220,12 @@ def process_jobs():
             time.sleep(10)
 
         finally:
-            # Enhanced cleanup with better error handling
-            if job and job.get("temp_filepath"):
-                try:
-                    if os.path.exists(job["temp_filepath"]):
-                        success = safe_file_remove(job["temp_filepath"])
-                        if success:
-                            print(f"Cleaned up temporary file: {job['temp_filepath']}")
-                        else:
-                            print(f"Partial cleanup - could not remove: {job['temp_filepath']}")
-                except Exception as e:
-                    print(f"Error during file cleanup for job {job.get('_id', 'unknown')}: {e}")
\ No newline at end of file
+            # Remove the archive from the upload store once the job is done with it.
+            if job and get_upload_key(job):
+                delete_upload(jobs_collection, job)
+
+
+# Workers can also run on their own, e.g. on another node sharing the upload store:
+#   python worker.py
+if __name__ == '__main__':
+    process_jobs()